@@ -1,5 +1,7 @@
 import os
 from functools import lru_cache
+from pathlib import Path
+from typing import Optional
 
 
 class Settings:
@@ -26,6 +28,28 @@ class Settings:
 		self.app_host: str = os.getenv("APP_HOST", "127.0.0.1")
 		self.app_port: int = int(os.getenv("APP_PORT", "8000"))
 
+		# Fitted potability models (joblib/ONNX) are cached here
+		self.model_cache_dir: str = os.getenv(
+			"MODEL_CACHE_DIR", str(Path(__file__).resolve().parents[2] / ".cache")
+		)
+
+		# Generic OCR shortcuts, opt-in until they are measured on real
+		# captures. With OCR_CLEAN_GATE set, inputs at least this sharp
+		# (Laplacian variance of a 256x256 thumbnail) and contrasty (gray std)
+		# skip preprocessing
+		self.ocr_clean_gate: bool = os.getenv("OCR_CLEAN_GATE", "").lower() in ("1", "true", "yes")
+		self.ocr_clean_min_laplacian_var: float = float(os.getenv("OCR_CLEAN_MIN_LAPLACIAN_VAR", "1000"))
+		self.ocr_clean_min_std: float = float(os.getenv("OCR_CLEAN_MIN_STD", "60"))
+		# When set, inputs that already have at least this gray std get a
+		# global equalizeHist instead of the much slower CLAHE
+		equalize_min_std = os.getenv("OCR_EQUALIZE_MIN_STD", "")
+		self.ocr_equalize_min_std: Optional[float] = float(equalize_min_std) if equalize_min_std else None
+
+		# Fixed-form OCR: detect text once on the whole canonical image and only
+		# run the recognizer per write area. Off until it has been compared with
+		# the per-crop readtext path on real captures
+		self.ocr_canonical_detection: bool = os.getenv("OCR_CANONICAL_DETECTION", "").lower() in ("1", "true", "yes")
+
 	@property
 	def database_url(self) -> str:
 		"""Construct the SQLAlchemy-compatible Postgres URL from env pieces."""
@@ -1,21 +1,37 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
+import asyncio
 import logging
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 
 from app.core.config import get_settings
 from app.routes.ocr import router as ocr_router
 from app.routes.fiducial import router as fiducial_router
 from app.routes.predict import router as predict_router
+from app.services.ocr import get_ocr_service
 
 # Enable debug logging for fiducial detection
 logging.basicConfig(level=logging.DEBUG)
 logging.getLogger("app.routes.fiducial").setLevel(logging.DEBUG)
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="ML App Backend")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	"""Build the default OCR reader and warm it up before serving requests."""
+	try:
+		await asyncio.to_thread(lambda: get_ocr_service().warmup())
+	except Exception:
+		# The OCR route builds the reader lazily again on its first request
+		logger.exception("OCR warm-up failed")
+	yield
+
+
+app = FastAPI(title="ML App Backend", lifespan=lifespan)
 
 
 _CONFIRM_TEMPLATE_PATH = (
@@ -26,6 +42,13 @@ try:
 except FileNotFoundError:
 	CONFIRMED_HTML = """<!DOCTYPE html><html><body><p>Email confirmed. You can close this page.</p></body></html>"""
 
+# The page is static, so encode it and build its headers once
+_CONFIRMED_BODY = CONFIRMED_HTML.encode("utf-8")
+_CONFIRMED_HEADERS = {
+	"content-length": str(len(_CONFIRMED_BODY)),
+	"content-type": "text/html; charset=utf-8",
+}
+
 
 @app.get("/health", tags=["health"])
 def health_check() -> dict:
@@ -33,14 +56,14 @@ def health_check() -> dict:
 
 
 @app.get("/auth/confirmed", response_class=HTMLResponse, tags=["auth"])
-async def email_confirmed(request: Request) -> HTMLResponse:
+async def email_confirmed(request: Request) -> Response:
 	"""Simple confirmation page Supabase can redirect to after email verification.
 
 	This does not perform any auth logic; Supabase has already confirmed the user
 	by the time it redirects. This just shows a friendly message.
 	"""
 
-	return HTMLResponse(content=CONFIRMED_HTML)
+	return Response(content=_CONFIRMED_BODY, headers=_CONFIRMED_HEADERS)
 
 
 def get_app() -> FastAPI:
@@ -0,0 +1,44 @@
+"""Image decoding and OpenCV helpers shared by the OCR and fiducial code."""
+
+from __future__ import annotations
+
+import threading
+
+import cv2
+import numpy as np
+
+
+# CLAHE objects keep scratch buffers between apply() calls, so they are
+# cached per thread rather than shared module-wide.
+_CLAHE_LOCAL = threading.local()
+
+
+def decode_bgr(image_bytes: bytes) -> np.ndarray:
+    """
+    Decode image bytes straight into a BGR array.
+    
+    cv2.imdecode applies the EXIF orientation itself, so there is no PIL
+    round-trip and no RGB->BGR conversion. PIL is only used for formats
+    OpenCV cannot decode, and is imported lazily so it stays off the
+    import path of the module.
+    """
+    image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is not None:
+        return image
+    from io import BytesIO
+    from PIL import Image, ImageOps
+    
+    with Image.open(BytesIO(image_bytes)) as pil_img:
+        pil_img = ImageOps.exif_transpose(pil_img)
+        return cv2.cvtColor(np.array(pil_img.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+def get_clahe(clip_limit: float) -> "cv2.CLAHE":
+    """Return this thread's CLAHE instance for ``clip_limit`` (8x8 tiles)."""
+    cache = getattr(_CLAHE_LOCAL, "instances", None)
+    if cache is None:
+        cache = _CLAHE_LOCAL.instances = {}
+    clahe = cache.get(clip_limit)
+    if clahe is None:
+        clahe = cache[clip_limit] = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(8, 8))
+    return clahe
@@ -1,24 +1,18 @@
 from __future__ import annotations
 
-import re
 import logging
 import os
-from dataclasses import dataclass
-from io import BytesIO
-from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
-from PIL import Image, ImageFilter, ImageOps
 
+from app.ml.imaging import decode_bgr, get_clahe
 
-_RESAMPLE = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
-_NUMERIC_PATTERN = re.compile(r"^-?(?:\d+\.?\d*|\d*\.\d+)$")
 logger = logging.getLogger(__name__)
 
-# Set up logging to show info level
-logging.basicConfig(level=logging.INFO)
-
 # Canonical dimensions matching the template exactly
 _CANONICAL_WIDTH = 1080
 _CANONICAL_HEIGHT = 1240
@@ -35,8 +29,17 @@ _FIDUCIAL_TARGETS = np.array(
 )
 
 # Detection parameters
+_CORNER_LABELS = ("tl", "tr", "br", "bl")
 _FIDUCIAL_MIN_AREA_RATIO = 0.0004
 _FIDUCIAL_MAX_AREA_RATIO = 0.025
+_FIDUCIAL_PYRAMID_MIN_EDGE = 1200  # Search on a pyrDown level above this long edge
+
+# Morphology kernels shared by the detection and preprocessing stages
+_KERNEL_2X2 = np.ones((2, 2), np.uint8)
+_KERNEL_3X3 = np.ones((3, 3), np.uint8)
+
+# Per-thread ping-pong buffers for the preprocessing chain, see _get_pp_buffers
+_PP_LOCAL = threading.local()
 
 # Debug flag - set to True to save intermediate images
 DEBUG_SAVE_IMAGES = os.environ.get("OCR_DEBUG", "").lower() in ("1", "true", "yes")
@@ -77,8 +80,7 @@ _WRITE_WIDTH = 435    # Detected ~445px, subtract margins
 _WRITE_HEIGHT = 85    # Detected ~97px, subtract margins for safety
 
 
-@dataclass(frozen=True)
-class WriteAreaSpec:
+class WriteAreaSpec(NamedTuple):
     """Precise pixel coordinates of a write-area in the canonical 1080x1240 image."""
     name: str
     x: int      # Left edge (pixels)
@@ -87,6 +89,7 @@ class WriteAreaSpec:
     height: int # Height (pixels)
 
 
+@lru_cache(maxsize=1)
 def _compute_write_areas() -> Tuple[WriteAreaSpec, ...]:
     """
     Compute exact pixel coordinates for all 10 write-areas.
@@ -124,8 +127,17 @@ def _compute_write_areas() -> Tuple[WriteAreaSpec, ...]:
     return tuple(areas)
 
 
+def _write_areas_xywh(areas: Sequence[WriteAreaSpec]) -> np.ndarray:
+    """Pack write-area rectangles into a contiguous (N, 4) int32 array of x, y, w, h."""
+    return np.array([(a.x, a.y, a.width, a.height) for a in areas], dtype=np.int32).reshape(-1, 4)
+
+
 WRITE_AREAS = _compute_write_areas()
 
+# Structure-of-arrays view of WRITE_AREAS for slicing without attribute lookups
+_WRITE_AREAS_XYWH = _write_areas_xywh(WRITE_AREAS)
+_WRITE_AREAS_NAMES: Tuple[str, ...] = tuple(area.name for area in WRITE_AREAS)
+
 
 def _load_and_normalize(image_bytes: bytes, target_long_edge: int = 1600) -> Tuple[np.ndarray, bool]:
     """
@@ -136,22 +148,23 @@ def _load_and_normalize(image_bytes: bytes, target_long_edge: int = 1600) -> Tup
     if not image_bytes:
         raise ValueError("No image payload provided")
     try:
-        with Image.open(BytesIO(image_bytes)) as pil_img:
-            pil_img = ImageOps.exif_transpose(pil_img)
-            pil_img = pil_img.convert("RGB")
-            
-            # Minimal preprocessing - don't over-process before detection
-            width, height = pil_img.size
-            long_edge = max(width, height)
-            if long_edge == 0:
-                raise ValueError("Invalid image dimensions")
-            
-            # Scale to reasonable size for processing
-            scale = target_long_edge / long_edge
-            if abs(scale - 1.0) > 0.05:
-                pil_img = pil_img.resize((int(width * scale), int(height * scale)), _RESAMPLE)
-            
-            image = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+        image = decode_bgr(image_bytes)
+        
+        # Minimal preprocessing - don't over-process before detection
+        height, width = image.shape[:2]
+        long_edge = max(width, height)
+        if long_edge == 0:
+            raise ValueError("Invalid image dimensions")
+        
+        # Scale to reasonable size for processing. Phone photos are almost
+        # always shrunk; INTER_AREA is the cheap, alias-free filter for that.
+        scale = target_long_edge / long_edge
+        if abs(scale - 1.0) > 0.05:
+            image = cv2.resize(
+                image,
+                (int(width * scale), int(height * scale)),
+                interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC,
+            )
     except Exception as exc:
         raise ValueError("Unable to decode image for OCR processing") from exc
     
@@ -227,33 +240,37 @@ def _detect_fiducials(image: np.ndarray) -> Optional[Dict[str, np.ndarray]]:
     
     Uses multiple thresholding strategies to handle varying lighting conditions.
     The markers are pure black 56x56px squares positioned in the corners.
+    
+    Large images are searched at half resolution (markers still span ~20px
+    there) and each marker center is then refined on the full-res image.
     """
-    height, width = image.shape[:2]
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # Convert before building the pyramid: pyrDown on one channel instead of three
+    full_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    scale = 1.0
+    gray = full_gray
+    if max(full_gray.shape) >= _FIDUCIAL_PYRAMID_MIN_EDGE:
+        gray = cv2.pyrDown(full_gray)
+        scale = 2.0
+    
+    height, width = gray.shape
     
     image_area = float(height * width)
     min_area = image_area * _FIDUCIAL_MIN_AREA_RATIO
     max_area = image_area * _FIDUCIAL_MAX_AREA_RATIO
     
-    all_candidates: List[Tuple[str, float, float, float]] = []
-    
-    # Strategy 1: Fixed threshold for pure black
-    _, thresh1 = cv2.threshold(gray, 80, 255, cv2.THRESH_BINARY_INV)
-    
-    # Strategy 2: Otsu's method
-    _, thresh2 = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    # Summed-area table of the gray image, shared by all threshold strategies.
+    # Any box mean becomes four lookups instead of a full-image mask per contour.
+    integral = cv2.integral(gray)
     
-    # Strategy 3: Adaptive threshold for uneven lighting
-    thresh3 = cv2.adaptiveThreshold(
-        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-        cv2.THRESH_BINARY_INV, 51, 15
-    )
+    cand_x: List[float] = []
+    cand_y: List[float] = []
+    cand_score: List[float] = []
+    cand_size: List[float] = []
     
-    for thresh in [thresh1, thresh2, thresh3]:
+    for thresh in _fiducial_threshold_strategies(gray):
         # Morphological cleanup
-        kernel = np.ones((3, 3), np.uint8)
-        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel, iterations=2)
-        cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, kernel, iterations=1)
+        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, _KERNEL_3X3, iterations=2)
+        cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, _KERNEL_3X3, iterations=1)
         
         contours, _ = cv2.findContours(cleaned, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
@@ -271,7 +288,17 @@ def _detect_fiducials(image: np.ndarray) -> Optional[Dict[str, np.ndarray]]:
             if aspect < 0.65 or aspect > 1.5:
                 continue
             
-            # Check solidity (must be filled)
+            # Verify the region is actually dark. The central half of the
+            # bounding box lies inside a square marker at any rotation, so its
+            # mean (from the integral image) stands in for the contour mask.
+            x0, y0 = x + w // 4, y + h // 4
+            x1, y1 = x0 + max(w // 2, 1), y0 + max(h // 2, 1)
+            box_sum = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+            mean_intensity = box_sum / float((x1 - x0) * (y1 - y0))
+            if mean_intensity > 120:
+                continue
+            
+            # Check solidity (must be filled) - only for the few dark survivors
             hull = cv2.convexHull(contour)
             hull_area = cv2.contourArea(hull)
             if hull_area == 0:
@@ -280,85 +307,200 @@ def _detect_fiducials(image: np.ndarray) -> Optional[Dict[str, np.ndarray]]:
             if solidity < 0.75:
                 continue
             
-            # Verify the region is actually dark
-            mask = np.zeros(gray.shape, dtype=np.uint8)
-            cv2.drawContours(mask, [contour], -1, 255, -1)
-            mean_intensity = cv2.mean(gray, mask=mask)[0]
-            if mean_intensity > 120:
-                continue
-            
-            cx = x + w / 2.0
-            cy = y + h / 2.0
-            label = _classify_corner(cx, cy, width, height)
-            
-            if label:
-                score = solidity * (1.0 - abs(1.0 - aspect))
-                all_candidates.append((label, cx, cy, score))
+            cand_x.append(x + w / 2.0)
+            cand_y.append(y + h / 2.0)
+            cand_score.append(solidity * (1.0 - abs(1.0 - aspect)))
+            cand_size.append(float(max(w, h)))
+        
+        centers = np.column_stack((cand_x, cand_y)).astype(np.float32) if cand_x else np.empty((0, 2), np.float32)
+        labels = _classify_corners(centers, width, height)
+        # Each strategy costs a full-image threshold + morphology + contour
+        # pass; stop as soon as every corner has a candidate.
+        if np.unique(labels[labels >= 0]).size == len(_CORNER_LABELS):
+            break
+    
+    scores = np.asarray(cand_score, dtype=np.float32)
     
-    # Remove duplicates and pick best for each corner
+    # Pick best candidate for each corner: scores masked per label, (N, 4)
+    per_label = np.where(
+        labels[:, None] == np.arange(len(_CORNER_LABELS)), scores[:, None], -np.inf
+    )
     corners: Dict[str, np.ndarray] = {}
-    for label in ("tl", "tr", "br", "bl"):
-        best = None
-        for cand in all_candidates:
-            if cand[0] == label:
-                if best is None or cand[3] > best[3]:
-                    best = cand
-        if best:
-            corners[label] = np.array([best[1], best[2]], dtype=np.float32)
-    
-    logger.debug("Fiducial detection found %d/4 corners: %s", len(corners), list(corners.keys()))
+    if len(per_label):
+        best_idx = per_label.argmax(axis=0)
+        for label_idx, label in enumerate(_CORNER_LABELS):
+            best = best_idx[label_idx]
+            if np.isfinite(per_label[best, label_idx]):
+                corners[label] = _refine_fiducial_center(
+                    full_gray, centers[best] * scale, cand_size[best] * scale
+                )
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Fiducial detection found %d/4 corners: %s", len(corners), list(corners.keys()))
     return corners if len(corners) == 4 else None
 
 
-def _classify_corner(cx: float, cy: float, width: int, height: int) -> Optional[str]:
-    """Classify a detected marker as one of the four corners."""
+def _refine_fiducial_center(gray: np.ndarray, center: np.ndarray, size: float) -> np.ndarray:
+    """
+    Re-measure a marker center on the full-res gray image from a coarse estimate.
+    
+    Thresholds a ROI about twice the marker size and takes the bounding-box
+    center of the dark blob under the estimate. Falls back to the estimate
+    when no such blob is found.
+    """
+    height, width = gray.shape
+    cx, cy = float(center[0]), float(center[1])
+    half = int(np.ceil(size))
+    x0, y0 = max(int(cx) - half, 0), max(int(cy) - half, 0)
+    x1, y1 = min(int(cx) + half + 1, width), min(int(cy) + half + 1, height)
+    if x1 <= x0 or y1 <= y0:
+        return np.array([cx, cy], dtype=np.float32)
+    
+    _, mask = cv2.threshold(gray[y0:y1, x0:x1], 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    for contour in contours:
+        if cv2.pointPolygonTest(contour, (cx - x0, cy - y0), False) < 0:
+            continue
+        x, y, w, h = cv2.boundingRect(contour)
+        # A blob much larger than the marker means the ROI ran into background
+        if max(w, h) > size * 1.5:
+            break
+        return np.array([x0 + x + w / 2.0, y0 + y + h / 2.0], dtype=np.float32)
+    return np.array([cx, cy], dtype=np.float32)
+
+
+def _fiducial_threshold_strategies(gray: np.ndarray) -> Iterator[np.ndarray]:
+    """
+    Yield binary masks for fiducial detection, cheapest strategy first.
+    
+    Masks are computed lazily so later strategies cost nothing when an
+    earlier one already found all four corners. They cannot simply be OR-ed
+    together: Otsu tends to flood the photo background and the adaptive
+    threshold outlines markers, both of which merge the markers into
+    neighbouring blobs.
+    """
+    # Strategy 1: Fixed threshold for pure black
+    _, thresh = cv2.threshold(gray, 80, 255, cv2.THRESH_BINARY_INV)
+    yield thresh
+    
+    # Strategy 2: Otsu's method
+    _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    yield thresh
+    
+    # Strategy 3: Adaptive threshold for uneven lighting
+    yield cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY_INV, 51, 15
+    )
+
+
+def _classify_corners(centers: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Classify (N, 2) marker centers as corners in one vectorized pass.
+    
+    Returns an int8 array of indices into ``_CORNER_LABELS`` (-1 = not in a corner).
+    """
     # Fiducials should be in the outer 35% of each dimension
     margin_ratio = 0.35
+    cx = centers[:, 0]
+    cy = centers[:, 1]
     
-    if cx < width * margin_ratio:
-        x_side = "l"
-    elif cx > width * (1 - margin_ratio):
-        x_side = "r"
-    else:
-        return None
-    
-    if cy < height * margin_ratio:
-        y_side = "t"
-    elif cy > height * (1 - margin_ratio):
-        y_side = "b"
-    else:
-        return None
+    is_left = cx < width * margin_ratio
+    is_right = cx > width * (1 - margin_ratio)
+    is_top = cy < height * margin_ratio
+    is_bottom = cy > height * (1 - margin_ratio)
     
-    return y_side + x_side
+    labels = np.full(len(centers), -1, dtype=np.int8)
+    labels[is_top & is_left] = 0
+    labels[is_top & is_right] = 1
+    labels[is_bottom & is_right] = 2
+    labels[is_bottom & is_left] = 3
+    return labels
+
+
+# Preprocessing variants tried on every write area, see _select_best_value
+_PREPROCESS_MODES = ("simple", "binarized")
+
+# Both preprocessors upscale the crop by _OCR_UPSCALE and then pad it with
+# _OCR_PAD white pixels; text boxes found on the canonical image are mapped
+# into preprocessed crops with the same transform
+_OCR_UPSCALE = 2
+_OCR_PAD = 10
+
+# A field read with at least this many digits at this detection confidence
+# by one preprocessing pass skips the remaining passes
+_EARLY_EXIT_MIN_CONFIDENCE = 0.6
+_EARLY_EXIT_MIN_DIGITS = 2
+
+# When the first pass reads every field with at least this confidence the
+# remaining passes are skipped altogether, single-digit fields included
+_EARLY_EXIT_ALL_FIELDS_CONFIDENCE = 0.7
+
+# A canonical text box is read for a write area when at least this fraction
+# of it (or of the area, for boxes larger than the area) overlaps the area.
+# Overlap rather than box centre, so a box that runs from the printed label
+# into the written value still counts for the value
+_BOX_MIN_OVERLAP = 0.25
 
 
 # ============================================================================
 # NEW SIMPLIFIED PREPROCESSING - Less aggressive, preserves digit features
 # ============================================================================
 
-def _preprocess_for_ocr_simple(region: np.ndarray) -> np.ndarray:
+def _get_pp_buffers(shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return this thread's pair of uint8 scratch buffers of ``shape``.
+    
+    Write-area crops are nearly always the same size, so the preprocessing
+    chain alternates between two buffers via ``dst=`` instead of allocating
+    a fresh image per OpenCV call. Buffers are reallocated on a size change.
+    """
+    buffers = getattr(_PP_LOCAL, "buffers", None)
+    if buffers is None or buffers[0].shape != shape:
+        buffers = _PP_LOCAL.buffers = (
+            np.empty(shape, dtype=np.uint8),
+            np.empty(shape, dtype=np.uint8),
+        )
+    return buffers
+
+
+def _upscale_for_ocr(region: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """Upscale a crop by _OCR_UPSCALE (cubic) to the gray working resolution of both preprocessors."""
+    # Callers normally pass the gray crop; BGR crops are still accepted
+    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if region.ndim == 3 else region
+    h, w = gray.shape
+    return cv2.resize(gray, (w * _OCR_UPSCALE, h * _OCR_UPSCALE), dst=dst, interpolation=cv2.INTER_CUBIC)
+
+
+def _preprocess_for_ocr_simple(region: np.ndarray, prescaled: bool = False, return_gray: bool = False) -> np.ndarray:
     """
     Preprocessing for photographed forms (not scans).
     
     Key insight: Camera photos have grayish backgrounds (~190-200) not pure white.
     We need ADAPTIVE thresholding to handle uneven lighting.
     Also need to filter out template guide lines while keeping dark ink.
+    
+    Pass ``prescaled=True`` when ``region`` is already an _upscale_for_ocr result,
+    and ``return_gray=True`` to skip the final GRAY2BGR (e.g. for PNG previews).
     """
     if region.size == 0:
         return region
     
-    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
-    
     # Upscale 2x for better digit recognition
-    h, w = gray.shape
-    scaled = cv2.resize(gray, (w * 2, h * 2), interpolation=cv2.INTER_CUBIC)
+    if prescaled:
+        scaled = region
+        buf_a, buf_b = _get_pp_buffers(region.shape)
+    else:
+        h, w = region.shape[:2]
+        buf_a, buf_b = _get_pp_buffers((h * _OCR_UPSCALE, w * _OCR_UPSCALE))
+        scaled = _upscale_for_ocr(region, dst=buf_a)
     
     # Apply CLAHE to normalize contrast across the region
-    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-    normalized = clahe.apply(scaled)
+    normalized = get_clahe(3.0).apply(scaled, dst=buf_b)
     
     # Gaussian blur to reduce noise
-    blurred = cv2.GaussianBlur(normalized, (5, 5), 0)
+    blurred = cv2.GaussianBlur(normalized, (5, 5), 0, dst=buf_a)
     
     # ADAPTIVE thresholding - works with uneven lighting from photos
     # blockSize=31 looks at local ~15px neighborhood
@@ -369,60 +511,137 @@ def _preprocess_for_ocr_simple(region: np.ndarray) -> np.ndarray:
         cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
         cv2.THRESH_BINARY,
         blockSize=31,
-        C=35  # Aggressive - filters out guide lines and faint artifacts
+        C=35,  # Aggressive - filters out guide lines and faint artifacts
+        dst=buf_b,
     )
     
-    # Morphological operations to clean up
-    kernel = np.ones((2, 2), np.uint8)
-    # Open to remove small noise specks (like guide line remnants)
-    cleaned = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
-    # Close to connect broken strokes
-    cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, kernel)
+    # Clean up isolated specks of either polarity (guide line remnants, pin
+    # holes in strokes) in one SIMD pass instead of an open + close pair
+    cleaned = cv2.medianBlur(binary, 3, dst=buf_a)
     
     # Add border padding (helps OCR)
-    padded = cv2.copyMakeBorder(cleaned, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=255)
+    padded = cv2.copyMakeBorder(cleaned, _OCR_PAD, _OCR_PAD, _OCR_PAD, _OCR_PAD, cv2.BORDER_CONSTANT, value=255)
     
+    if return_gray:
+        return padded
     return cv2.cvtColor(padded, cv2.COLOR_GRAY2BGR)
 
 
-def _preprocess_for_ocr_binarized(region: np.ndarray) -> np.ndarray:
+def _preprocess_for_ocr_binarized(region: np.ndarray, prescaled: bool = False, return_gray: bool = False) -> np.ndarray:
     """
     Alternative preprocessing with Otsu's method.
     Used when adaptive thresholding doesn't work well.
     Otsu automatically finds the optimal threshold for bimodal distributions.
+    
+    Pass ``prescaled=True`` when ``region`` is already an _upscale_for_ocr result,
+    and ``return_gray=True`` to skip the final GRAY2BGR (e.g. for PNG previews).
     """
     if region.size == 0:
         return region
     
-    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
-    
     # Upscale
-    h, w = gray.shape
-    scaled = cv2.resize(gray, (w * 2, h * 2), interpolation=cv2.INTER_CUBIC)
+    if prescaled:
+        scaled = region
+        buf_a, buf_b = _get_pp_buffers(region.shape)
+    else:
+        h, w = region.shape[:2]
+        buf_a, buf_b = _get_pp_buffers((h * _OCR_UPSCALE, w * _OCR_UPSCALE))
+        scaled = _upscale_for_ocr(region, dst=buf_a)
     
     # Apply CLAHE first to improve contrast
-    clahe = cv2.createCLAHE(clipLimit=4.0, tileGridSize=(8, 8))
-    enhanced = clahe.apply(scaled)
+    enhanced = get_clahe(4.0).apply(scaled, dst=buf_b)
     
     # Gaussian blur
-    blurred = cv2.GaussianBlur(enhanced, (5, 5), 0)
+    blurred = cv2.GaussianBlur(enhanced, (5, 5), 0, dst=buf_a)
     
     # Otsu's method automatically finds the optimal threshold
-    _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=buf_b)
     
     # Remove small noise with morphological open
-    kernel = np.ones((2, 2), np.uint8)
-    opened = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
+    opened = cv2.morphologyEx(binary, cv2.MORPH_OPEN, _KERNEL_2X2, dst=buf_a)
     
     # Close small gaps in strokes
-    closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, kernel)
+    closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, _KERNEL_2X2, dst=buf_b)
     
     # Padding
-    padded = cv2.copyMakeBorder(closed, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=255)
+    padded = cv2.copyMakeBorder(closed, _OCR_PAD, _OCR_PAD, _OCR_PAD, _OCR_PAD, cv2.BORDER_CONSTANT, value=255)
     
+    if return_gray:
+        return padded
     return cv2.cvtColor(padded, cv2.COLOR_GRAY2BGR)
 
 
+# Very conservative corrections - only the most common OCR errors
+# that are unambiguous
+_OCR_CORRECTIONS = str.maketrans({
+    'O': '0',   # Capital O -> 0
+    'o': '0',   # Lowercase o -> 0 (when in numeric context)
+    'l': '1',   # Lowercase L -> 1
+    'I': '1',   # Capital I -> 1
+    '|': '1',   # Pipe -> 1
+    ',': '.',   # European decimal comma -> point
+})
+
+
+def _digits_only(text: str) -> str:
+    """Drop every non-digit from ``text``; the all-digit case is a single C call."""
+    if text.isdigit():
+        return text
+    return "".join([char for char in text if char.isdigit()])
+
+
+def _letterbox(batch: List[np.ndarray]) -> List[np.ndarray]:
+    """
+    Pad preprocessed crops to a common shape so they can be stacked.
+    
+    Crops are padded at the bottom/right with the white background both
+    preprocessors already use, so no text is moved or resized.
+    """
+    max_h = max(processed.shape[0] for processed in batch)
+    max_w = max(processed.shape[1] for processed in batch)
+    return [
+        processed if processed.shape[:2] == (max_h, max_w) else cv2.copyMakeBorder(
+            processed, 0, max_h - processed.shape[0], 0, max_w - processed.shape[1],
+            cv2.BORDER_CONSTANT, value=(255, 255, 255),
+        )
+        for processed in batch
+    ]
+
+
+def _boxes_for_crop(boxes: np.ndarray, bounds: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Select (M, 4) canonical [x1, y1, x2, y2] boxes overlapping ``bounds``.
+    
+    A box is kept when its intersection with the crop covers at least
+    _BOX_MIN_OVERLAP of the box, or of the crop if the box is larger. Kept
+    boxes are clipped to the crop and mapped into the coordinates of its
+    preprocessed (upscaled and padded) version.
+    """
+    x1, y1, x2, y2 = bounds
+    clipped = np.clip(boxes, [x1, y1, x1, y1], [x2, y2, x2, y2])
+    inter_w = clipped[:, 2] - clipped[:, 0]
+    inter_h = clipped[:, 3] - clipped[:, 1]
+    box_area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    reference = np.minimum(box_area, (x2 - x1) * (y2 - y1))
+    keep = (inter_w > 0) & (inter_h > 0) & (inter_w * inter_h >= _BOX_MIN_OVERLAP * reference)
+    local = clipped[keep] - np.array([x1, y1, x1, y1], dtype=np.int32)
+    return local * _OCR_UPSCALE + _OCR_PAD
+
+
+def _is_numeric(text: str) -> bool:
+    """
+    Check ``text`` against ``-?(\d+\.?\d*|\d*\.\d+)`` using C-level str methods.
+    
+    Cheaper than a regex match per OCR token; isdecimal() matches exactly
+    the characters ``\d`` does.
+    """
+    if text.startswith("-"):
+        text = text[1:]
+    if not text or text == ".":
+        return False
+    return text.replace(".", "", 1).isdecimal()
+
+
 # ============================================================================
 # NEW EXTRACTOR CLASS - Uses precise pixel coordinates
 # ============================================================================
@@ -439,6 +658,29 @@ class WaterQualityOCRExtractor:
     5. Robust decimal detection
     """
     
+    # Allow digits and decimal point/comma
+    _ALLOWLIST = "0123456789.,"
+    
+    # EasyOCR settings, built once; batch_size is the only per-call argument
+    _RECOGNIZE_KW = {
+        "allowlist": _ALLOWLIST,
+        "detail": 1,
+        "paragraph": False,
+        "decoder": "greedy",      # Faster, works well for numbers
+        "contrast_ths": 0.2,      # Lower contrast requirement
+        "adjust_contrast": 0.6,   # Moderate contrast adjustment
+    }
+    # Balanced detector settings: capture more text while filtering noise
+    _READTEXT_KW = {
+        **_RECOGNIZE_KW,
+        "min_size": 8,            # Slightly smaller to catch decimal points
+        "text_threshold": 0.4,    # Lower threshold to catch more characters
+        "low_text": 0.3,          # More permissive for faint strokes
+        "link_threshold": 0.6,    # Link nearby characters (helps "4.0" stay together)
+        "width_ths": 0.8,         # Allow wider character spacing
+        "mag_ratio": 1.5,         # Magnify text slightly for detection
+    }
+    
     def __init__(
         self,
         write_areas: Sequence[WriteAreaSpec],
@@ -446,19 +688,31 @@ class WaterQualityOCRExtractor:
         confidence_threshold: float = 0.15,  # Very low - we validate with regex
     ) -> None:
         self._areas = tuple(write_areas)
+        self._xywh = _write_areas_xywh(self._areas)
         self._threshold = confidence_threshold
-        # Allow digits and decimal point/comma
-        self._allowlist = "0123456789.,"
     
-    def extract(self, image_bytes: bytes, reader: "easyocr.Reader") -> Dict[str, Optional[str]]:
-        """Extract all field values from the image."""
+    def extract(
+        self,
+        image_bytes: bytes,
+        reader: "easyocr.Reader",
+        *,
+        canonical_detection: bool = False,
+    ) -> Dict[str, Optional[str]]:
+        """
+        Extract all field values from the image.
+        
+        By default every preprocessed crop goes through readtext_batched
+        (detection + recognition per crop). With ``canonical_detection`` the
+        detector instead runs once on the canonical image and crops that get
+        text boxes only go through the recognizer.
+        """
         logger.info("=" * 60)
         logger.info("STARTING OCR EXTRACTION")
         logger.info("=" * 60)
         
         image, is_canonical = _load_and_normalize(image_bytes)
         
-        logger.info(f"Image loaded: shape={image.shape}, is_canonical={is_canonical}")
+        logger.info("Image loaded: shape=%s, is_canonical=%s", image.shape, is_canonical)
         
         results: Dict[str, Optional[str]] = {area.name: None for area in self._areas}
         
@@ -480,109 +734,295 @@ class WaterQualityOCRExtractor:
                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 255), 1)
             _save_debug_image(debug_img, "00_regions_overlay.png")
         
-        # Process each write area
+        # Convert to gray once; every field and mode crops from this buffer
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        
+        # Optionally find text once on the whole canonical image; each write
+        # area then only needs the recognizer on the boxes that fall inside it
+        text_boxes = self._detect_text_boxes(image, reader) if canonical_detection else None
+        
+        # Crop and upscale every write area once; both preprocessing passes
+        # reuse the upscaled gray crops
+        crops: List[Tuple[str, np.ndarray, Optional[np.ndarray]]] = []
         for idx, area in enumerate(self._areas):
-            logger.info(f"\n--- Processing field: {area.name} ---")
-            logger.info(f"    Region: x={area.x}, y={area.y}, w={area.width}, h={area.height}")
+            logger.info("\n--- Processing field: %s ---", area.name)
+            logger.info("    Region: x=%s, y=%s, w=%s, h=%s", area.x, area.y, area.width, area.height)
+            
+            region, region_gray = self._crop_write_area(image, gray, self._xywh[idx])
+            area_boxes = None
+            if text_boxes is not None:
+                area_boxes = _boxes_for_crop(text_boxes, self._crop_bounds(gray.shape, self._xywh[idx]))
+            logger.info("    Cropped region shape: %s", region.shape)
             
-            region = self._crop_write_area(image, area)
-            logger.info(f"    Cropped region shape: {region.shape}")
+            if region_gray.size == 0:
+                logger.warning("    Empty region for %s", area.name)
+                continue
             
             if DEBUG_SAVE_IMAGES:
                 _save_debug_image(region, f"region_{idx:02d}_{area.name}_raw.png")
             
-            # Try BOTH preprocessing methods and pick the best result
-            value_simple = self._extract_from_region(region, reader, area.name, "simple")
-            value_binarized = self._extract_from_region(region, reader, area.name, "binarized")
+            crops.append((area.name, _upscale_for_ocr(region_gray), area_boxes))
+        
+        # Try BOTH preprocessing methods and pick the best result. Each mode
+        # runs as one batch over the fields still pending; a field the simple
+        # pass already read confidently skips the binarized pass, and a
+        # capture whose first pass reads every field well skips it entirely.
+        values: Dict[str, Dict[str, Optional[str]]] = {area.name: {} for area in self._areas}
+        pending = crops
+        for pass_idx, preprocess_mode in enumerate(_PREPROCESS_MODES):
+            batch: List[np.ndarray] = []
+            for field_name, scaled, _ in pending:
+                processed = self._preprocess_region(scaled, preprocess_mode)
+                logger.info("    Preprocessing %s: %s, result shape: %s", field_name, preprocess_mode, processed.shape)
+                if DEBUG_SAVE_IMAGES:
+                    _save_debug_image(processed, f"region_{field_name}_{preprocess_mode}.png")
+                batch.append(processed)
+            
+            batch_detections = self._read_crops(batch, [boxes for _, _, boxes in pending], reader)
+            still_pending = []
+            min_confidence = 1.0
+            for crop, detections in zip(pending, batch_detections):
+                field_name = crop[0]
+                value, confidence = self._result_from_detections(detections, field_name, preprocess_mode)
+                values[field_name][preprocess_mode] = value
+                min_confidence = min(min_confidence, confidence if value is not None else 0.0)
+                if self._is_confident(value, confidence):
+                    logger.info("    %s settled by %s pass (conf=%.3f)", field_name, preprocess_mode, confidence)
+                else:
+                    still_pending.append(crop)
+            
+            if (
+                pass_idx == 0
+                and len(crops) == len(self._areas)
+                and min_confidence >= _EARLY_EXIT_ALL_FIELDS_CONFIDENCE
+            ):
+                logger.info("    All fields read by %s pass (min conf=%.3f)", preprocess_mode, min_confidence)
+                break
+            
+            pending = still_pending
+            if not pending:
+                break
+        
+        for area in self._areas:
+            per_mode = values[area.name]
             
             # Smart selection: prefer longer valid result (more digits captured)
             # This helps with cases like "4.0" vs "0" - pick "4.0"
-            value = self._select_best_value(value_simple, value_binarized, area.name)
+            value = self._select_best_value(per_mode.get("simple"), per_mode.get("binarized"), area.name)
             
             results[area.name] = value
-            logger.info(f"    FINAL VALUE for {area.name}: {value}")
+            logger.info("    FINAL VALUE for %s: %s", area.name, value)
         
         logger.info("=" * 60)
-        logger.info(f"EXTRACTION COMPLETE: {results}")
+        logger.info("EXTRACTION COMPLETE: %s", results)
         logger.info("=" * 60)
         
         return results
     
-    def _crop_write_area(self, image: np.ndarray, area: WriteAreaSpec) -> np.ndarray:
-        """Crop write area with small safety margin."""
-        h, w = image.shape[:2]
+    def warmup(self, reader: "easyocr.Reader", *, canonical_detection: bool = False) -> None:
+        """
+        Push one dummy batch of the production shape through EasyOCR.
+        
+        The first forward pass pays for lazy initialization (CUDA context,
+        allocator pools); running it at startup keeps that off the first request.
+        """
+        blank = np.full((_CANONICAL_HEIGHT, _CANONICAL_WIDTH), 255, dtype=np.uint8)
+        if canonical_detection:
+            self._detect_text_boxes(cv2.cvtColor(blank, cv2.COLOR_GRAY2BGR), reader)
+        batch = [
+            self._preprocess_region(_upscale_for_ocr(self._crop_write_area(blank, blank, box)[1]), preprocess_mode)
+            for box in self._xywh
+            for preprocess_mode in _PREPROCESS_MODES
+        ]
+        self._read_batch([np.zeros_like(processed) for processed in batch], reader)
+    
+    def _crop_bounds(self, shape: Tuple[int, ...], box: np.ndarray) -> Tuple[int, int, int, int]:
+        """Return the (x1, y1, x2, y2) crop of an (x, y, w, h) box with small safety margin."""
+        h, w = shape[:2]
+        x, y, width, height = box.tolist()
         
         # Add small margin to handle slight misalignment
         margin = 3
-        x1 = max(0, area.x - margin)
-        y1 = max(0, area.y - margin)
-        x2 = min(w, area.x + area.width + margin)
-        y2 = min(h, area.y + area.height + margin)
+        x1 = max(0, x - margin)
+        y1 = max(0, y - margin)
+        x2 = min(w, x + width + margin)
+        y2 = min(h, y + height + margin)
+        return x1, y1, x2, y2
+    
+    def _crop_write_area(
+        self,
+        image: np.ndarray,
+        gray: np.ndarray,
+        box: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Crop an (x, y, w, h) write-area box with small safety margin from both the BGR and gray image."""
+        x1, y1, x2, y2 = self._crop_bounds(image.shape, box)
         
-        logger.debug(f"    Crop bounds: ({x1},{y1}) to ({x2},{y2})")
+        logger.debug("    Crop bounds: (%s,%s) to (%s,%s)", x1, y1, x2, y2)
         
-        return image[y1:y2, x1:x2]
+        return image[y1:y2, x1:x2], gray[y1:y2, x1:x2]
     
-    def _extract_from_region(
-        self, 
-        region: np.ndarray, 
-        reader: "easyocr.Reader",
-        field_name: str,
-        preprocess_mode: str
-    ) -> Optional[str]:
-        """Extract numeric value from a single region."""
-        if region.size == 0:
-            logger.warning(f"    Empty region for {field_name}")
+    @staticmethod
+    def _preprocess_region(scaled: np.ndarray, preprocess_mode: str) -> np.ndarray:
+        """Apply the named preprocessing to an _upscale_for_ocr gray crop."""
+        if preprocess_mode == "simple":
+            return _preprocess_for_ocr_simple(scaled, prescaled=True)
+        return _preprocess_for_ocr_binarized(scaled, prescaled=True)
+    
+    def _detect_text_boxes(self, image: np.ndarray, reader: "easyocr.Reader") -> Optional[np.ndarray]:
+        """
+        Run the CRAFT detector once over the whole canonical image.
+        
+        Returns an (M, 4) int32 array of [x1, y1, x2, y2] boxes in canonical
+        pixels, or None if detection failed.
+        """
+        try:
+            horizontal_list, free_list = reader.detect(
+                image,
+                min_size=8 // _OCR_UPSCALE,        # Same as per-crop, in canonical pixels
+                text_threshold=0.4,
+                low_text=0.3,
+                link_threshold=0.6,
+                width_ths=0.8,
+                # Same scale the crops are read at
+                mag_ratio=_OCR_UPSCALE * self._READTEXT_KW["mag_ratio"],
+            )
+        except Exception as e:
+            logger.error("    Text detection failed: %s", e)
             return None
         
-        # Apply preprocessing
-        if preprocess_mode == "simple":
-            processed = _preprocess_for_ocr_simple(region)
-        else:
-            processed = _preprocess_for_ocr_binarized(region)
+        # EasyOCR returns [x_min, x_max, y_min, y_max] boxes plus free-form
+        # quads; the canonical image is already deskewed so the quads can be
+        # reduced to their bounding boxes
+        boxes = [[x_min, y_min, x_max, y_max] for x_min, x_max, y_min, y_max in horizontal_list[0]]
+        for quad in free_list[0]:
+            xs = [point[0] for point in quad]
+            ys = [point[1] for point in quad]
+            boxes.append([min(xs), min(ys), max(xs), max(ys)])
         
-        logger.info(f"    Preprocessing mode: {preprocess_mode}, result shape: {processed.shape}")
+        logger.info("    Text boxes on canonical image: %d", len(boxes))
+        return np.array(boxes, dtype=np.int32).reshape(-1, 4)
+    
+    def _read_crops(
+        self,
+        batch: List[np.ndarray],
+        batch_boxes: List[Optional[np.ndarray]],
+        reader: "easyocr.Reader"
+    ) -> List[List]:
+        """
+        OCR preprocessed crops, one detection list per crop in input order.
         
-        if DEBUG_SAVE_IMAGES:
-            _save_debug_image(processed, f"region_{field_name}_{preprocess_mode}.png")
+        Crops with text boxes from the canonical detection pass only go
+        through the recognizer; crops without any (or if detection failed)
+        fall back to per-crop detection via readtext_batched.
+        """
+        results: List[List] = [[] for _ in batch]
+        with_boxes = [i for i, boxes in enumerate(batch_boxes) if boxes is not None and len(boxes)]
+        without_boxes = [i for i, boxes in enumerate(batch_boxes) if boxes is None or not len(boxes)]
+        
+        if with_boxes:
+            recognized = self._recognize_batch(
+                [batch[i] for i in with_boxes], [batch_boxes[i] for i in with_boxes], reader
+            )
+            if recognized is None:
+                without_boxes = sorted(without_boxes + with_boxes)
+            else:
+                for i, detections in zip(with_boxes, recognized):
+                    results[i] = detections
+        
+        for i, detections in zip(without_boxes, self._read_batch([batch[i] for i in without_boxes], reader)):
+            results[i] = detections
+        return results
+    
+    def _recognize_batch(
+        self,
+        batch: List[np.ndarray],
+        batch_boxes: List[np.ndarray],
+        reader: "easyocr.Reader"
+    ) -> Optional[List[List]]:
+        """
+        Recognize known text boxes across all crops in one recognizer call.
+        
+        The crops are stacked into a single mosaic so every box goes through
+        the recognizer in one batch; results are split back per crop by
+        their vertical position. Returns None if recognition failed.
+        """
+        padded = _letterbox(batch)
+        slot_height = padded[0].shape[0]
+        mosaic = np.vstack(padded)
+        
+        horizontal_list = []
+        for slot, boxes in enumerate(batch_boxes):
+            offset = slot * slot_height
+            horizontal_list.extend(
+                [x1, x2, y1 + offset, y2 + offset] for x1, y1, x2, y2 in boxes.tolist()
+            )
         
-        # Run EasyOCR with tuned parameters
-        # Balanced settings: capture more text while filtering noise
         try:
-            detections = reader.readtext(
-                processed,
-                allowlist=self._allowlist,
-                detail=1,
-                paragraph=False,
-                min_size=8,           # Slightly smaller to catch decimal points
-                text_threshold=0.4,   # Lower threshold to catch more characters
-                low_text=0.3,         # More permissive for faint strokes
-                link_threshold=0.6,   # Link nearby characters (helps "4.0" stay together)
-                decoder='greedy',     # Faster, works well for numbers
-                batch_size=1,
-                contrast_ths=0.2,     # Lower contrast requirement
-                adjust_contrast=0.6,  # Moderate contrast adjustment
-                width_ths=0.8,        # Allow wider character spacing
-                mag_ratio=1.5,        # Magnify text slightly for detection
+            detections = reader.recognize(
+                mosaic,
+                horizontal_list=horizontal_list,
+                free_list=[],
+                batch_size=len(horizontal_list),
+                **self._RECOGNIZE_KW,
             )
-            
-            logger.info(f"    EasyOCR detections ({preprocess_mode}): {len(detections)} items")
-            for det in detections:
-                bbox, text, conf = det
-                logger.info(f"      -> text='{text}', conf={conf:.3f}")
-                
         except Exception as e:
-            logger.error(f"    OCR failed for {field_name}: {e}")
+            logger.error("    Batched recognition failed for %d boxes: %s", len(horizontal_list), e)
             return None
         
+        per_crop: List[List] = [[] for _ in batch]
+        for bbox, text, conf in detections:
+            slot = min(int(bbox[0][1]) // slot_height, len(batch) - 1)
+            offset = slot * slot_height
+            per_crop[slot].append(([[x, y - offset] for x, y in bbox], text, conf))
+        return per_crop
+    
+    def _read_batch(self, batch: List[np.ndarray], reader: "easyocr.Reader") -> List[List]:
+        """
+        Run EasyOCR over all preprocessed crops in one readtext_batched call.
+        
+        Returns one detection list per crop, in input order (empty on failure).
+        """
+        if not batch:
+            return []
+        
+        # readtext_batched stacks its inputs, so they must share one shape
+        padded = _letterbox(batch)
+        
+        # Run EasyOCR with tuned parameters
+        try:
+            return reader.readtext_batched(padded, batch_size=len(padded), **self._READTEXT_KW)
+        except Exception as e:
+            logger.error("    Batched OCR failed for %d crops: %s", len(padded), e)
+            return [[] for _ in padded]
+    
+    def _result_from_detections(
+        self,
+        detections: List,
+        field_name: str,
+        preprocess_mode: str
+    ) -> Tuple[Optional[str], float]:
+        """Turn one crop's EasyOCR detections into (numeric value, max confidence)."""
+        logger.info("    EasyOCR detections (%s/%s): %d items", field_name, preprocess_mode, len(detections))
+        for det in detections:
+            bbox, text, conf = det
+            logger.info("      -> text='%s', conf=%.3f", text, conf)
+        
         if not detections:
-            logger.info(f"    No detections for {field_name} with {preprocess_mode}")
-            return None
+            logger.info("    No detections for %s with %s", field_name, preprocess_mode)
+            return None, 0.0
         
         # Process all detections
         result = self._process_detections(detections)
-        logger.info(f"    Processed result ({preprocess_mode}): {result}")
-        return result
+        logger.info("    Processed result (%s): %s", preprocess_mode, result)
+        return result, max(float(det[2]) for det in detections)
+    
+    @staticmethod
+    def _is_confident(value: Optional[str], confidence: float) -> bool:
+        """True if a single pass read a multi-digit value confidently enough to stop."""
+        if value is None or confidence < _EARLY_EXIT_MIN_CONFIDENCE:
+            return False
+        return sum(char.isdigit() for char in value) >= _EARLY_EXIT_MIN_DIGITS
     
     def _process_detections(self, detections: List) -> Optional[str]:
         """
@@ -604,11 +1044,11 @@ class WaterQualityOCRExtractor:
         # Filter to only confident detections
         confident_dets = [d for d in detections if d[2] >= MIN_CONF]
         
-        logger.info(f"    Confident detections (conf >= {MIN_CONF}): {len(confident_dets)}/{len(detections)}")
+        logger.info("    Confident detections (conf >= %s): %d/%d", MIN_CONF, len(confident_dets), len(detections))
         
         if not confident_dets:
             # NO confident detections - return None, don't use garbage
-            logger.info(f"    No confident detections - returning None (not using low-conf garbage)")
+            logger.info("    No confident detections - returning None (not using low-conf garbage)")
             return None
         
         # Sort confident detections by x-position (left to right)
@@ -619,7 +1059,7 @@ class WaterQualityOCRExtractor:
         if len(sorted_dets) == 1:
             text = str(sorted_dets[0][1]).strip()
             cleaned = self._clean_numeric(text)
-            logger.info(f"    Single detection: '{text}' -> '{cleaned}'")
+            logger.info("    Single detection: '%s' -> '%s'", text, cleaned)
             if cleaned and self._is_valid_number(cleaned):
                 return cleaned
             return None
@@ -638,15 +1078,15 @@ class WaterQualityOCRExtractor:
                 gap = x_start - last_x_end
                 # If gap is large (>50 pixels after 2x scaling = 25 original), treat as separate
                 if gap > 100:
-                    logger.info(f"    Large gap ({gap}px) - ignoring subsequent detection")
+                    logger.info("    Large gap (%spx) - ignoring subsequent detection", gap)
                     break
             
             combined_text += str(text).strip()
             last_x_end = x_end
         
-        logger.info(f"    Combined text: '{combined_text}'")
+        logger.info("    Combined text: '%s'", combined_text)
         cleaned = self._clean_numeric(combined_text)
-        logger.info(f"    After cleaning: '{cleaned}'")
+        logger.info("    After cleaning: '%s'", cleaned)
         
         if cleaned and self._is_valid_number(cleaned):
             return cleaned
@@ -663,34 +1103,10 @@ class WaterQualityOCRExtractor:
         if not text:
             return ""
         
-        # Very conservative corrections - only the most common OCR errors
-        # that are unambiguous
-        corrections = {
-            'O': '0',   # Capital O -> 0
-            'o': '0',   # Lowercase o -> 0 (when in numeric context)
-            'l': '1',   # Lowercase L -> 1
-            'I': '1',   # Capital I -> 1  
-            '|': '1',   # Pipe -> 1
-            ',': '.',   # European decimal comma -> point
-        }
-        
-        result = []
-        for char in text:
-            # Only apply correction if the character is in our limited set
-            corrected = corrections.get(char, char)
-            result.append(corrected)
-        
-        # Extract only digits and decimal points
-        cleaned = ""
-        has_decimal = False
-        for char in result:
-            if char.isdigit():
-                cleaned += char
-            elif char == '.' and not has_decimal:
-                # Only add decimal if we have at least one digit before it
-                # or if it's at the start (like ".5")
-                cleaned += '.'
-                has_decimal = True
+        # Apply the conservative corrections, then keep only digits and the
+        # first decimal point (like ".5" at the start)
+        head, decimal, tail = text.translate(_OCR_CORRECTIONS).partition('.')
+        cleaned = _digits_only(head) + decimal + _digits_only(tail)
         
         # Clean up the result
         # Remove leading zeros except for "0.xxx" 
@@ -710,14 +1126,14 @@ class WaterQualityOCRExtractor:
     
     def _is_valid_number(self, text: str) -> bool:
         """Check if text is a valid numeric value."""
-        if not text:
-            return False
-        try:
-            val = float(text)
-            # Reasonable range for water quality parameters
-            return -50 <= val <= 50000
-        except ValueError:
+        if not _is_numeric(text):
             return False
+        # Reasonable range for water quality parameters. Non-negative values
+        # with at most 4 integer digits are always inside it, so the common
+        # case never reaches float()
+        if not text.startswith("-") and len(text.partition(".")[0]) <= 4:
+            return True
+        return -50 <= float(text) <= 50000
     
     def _select_best_value(self, value1: Optional[str], value2: Optional[str], field_name: str) -> Optional[str]:
         """
@@ -729,7 +1145,7 @@ class WaterQualityOCRExtractor:
         3. If both have values, prefer the one with more information (longer, has decimal)
         4. If equal length, prefer the one that looks more like a typical measurement
         """
-        logger.info(f"    Selecting best value: simple='{value1}' vs binarized='{value2}'")
+        logger.info("    Selecting best value: simple='%s' vs binarized='%s'", value1, value2)
         
         if value1 is None and value2 is None:
             return None
@@ -756,34 +1172,34 @@ class WaterQualityOCRExtractor:
         score1 = score_value(value1)
         score2 = score_value(value2)
         
-        logger.info(f"    Scores: '{value1}'={score1} vs '{value2}'={score2}")
+        logger.info("    Scores: '%s'=%s vs '%s'=%s", value1, score1, value2, score2)
         
         # Prefer value with more digits (captures more of the number)
         if score1[2] > score2[2]:
-            logger.info(f"    Selected '{value1}' (more digits)")
+            logger.info("    Selected '%s' (more digits)", value1)
             return value1
         if score2[2] > score1[2]:
-            logger.info(f"    Selected '{value2}' (more digits)")
+            logger.info("    Selected '%s' (more digits)", value2)
             return value2
         
         # Same digit count - prefer one with decimal (more precise)
         if score1[1] > score2[1]:
-            logger.info(f"    Selected '{value1}' (has decimal)")
+            logger.info("    Selected '%s' (has decimal)", value1)
             return value1
         if score2[1] > score1[1]:
-            logger.info(f"    Selected '{value2}' (has decimal)")
+            logger.info("    Selected '%s' (has decimal)", value2)
             return value2
         
         # Still tied - prefer longer string
         if score1[0] > score2[0]:
-            logger.info(f"    Selected '{value1}' (longer)")
+            logger.info("    Selected '%s' (longer)", value1)
             return value1
         if score2[0] > score1[0]:
-            logger.info(f"    Selected '{value2}' (longer)")
+            logger.info("    Selected '%s' (longer)", value2)
             return value2
         
         # Completely tied - prefer simple preprocessing result
-        logger.info(f"    Tied - defaulting to simple: '{value1}'")
+        logger.info("    Tied - defaulting to simple: '%s'", value1)
         return value1
 
     def _fallback_full_ocr(
@@ -805,7 +1221,7 @@ class WaterQualityOCRExtractor:
                 paragraph=False,
             )
             
-            logger.info(f"Fallback found {len(detections)} detections")
+            logger.info("Fallback found %d detections", len(detections))
             
             # Extract any valid numbers found
             numbers = []
@@ -813,7 +1229,7 @@ class WaterQualityOCRExtractor:
                 text = self._clean_numeric(str(det[1]))
                 if text and self._is_valid_number(text):
                     numbers.append(text)
-                    logger.info(f"  Fallback number: {text}")
+                    logger.info("  Fallback number: %s", text)
             
             # Assign found numbers to fields (best effort)
             for i, area in enumerate(self._areas):
@@ -7,62 +7,90 @@ Simple, high-contrast, reliable detection.
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import cv2
 import numpy as np
 from fastapi import APIRouter, File, HTTPException, UploadFile
-from PIL import Image, ImageOps
-from io import BytesIO
+
+from app.ml.imaging import decode_bgr
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def _detect_black_squares(image: np.ndarray) -> List[Tuple[float, float, float, float]]:
-    """
-    Detect solid black square markers using multiple strategies.
-    Returns list of (center_x, center_y, width, height) for each detected square.
+# Row order of the (4, 3) [cx, cy, size] corner arrays; missing corners are NaN
+_CORNER_ORDER = ("tl", "tr", "bl", "br")
+_TL, _TR, _BL, _BR = range(4)
+_CORNER_INDEX = {label: idx for idx, label in enumerate(_CORNER_ORDER)}
+_CORNER_LABELS = frozenset(_CORNER_ORDER)
+_CORNER_MARGIN = 0.42  # Must be in outer 42% of image (more forgiving)
+_MORPH_KERNEL_3 = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+
+
+def _threshold_strategies(gray: np.ndarray) -> Iterator[np.ndarray]:
     """
-    height, width = image.shape[:2]
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    
-    detected = []
+    Yield the inverted binary masks of each detection strategy, cheapest first.
     
+    Masks are built lazily so the sweep in _detect_black_squares can stop as
+    soon as every corner has a candidate. The masks cannot simply be OR-ed into
+    one pass: Otsu floods the dark table around the sheet into the markers and
+    the adaptive thresholds only outline them.
+    """
     # Strategy 1: Fixed threshold for pure black (printed)
-    _, thresh1 = cv2.threshold(gray, 80, 255, cv2.THRESH_BINARY_INV)
+    yield cv2.threshold(gray, 80, 255, cv2.THRESH_BINARY_INV)[1]
     
     # Strategy 2: Higher threshold for screens (not pure black)
-    _, thresh2 = cv2.threshold(gray, 120, 255, cv2.THRESH_BINARY_INV)
+    yield cv2.threshold(gray, 120, 255, cv2.THRESH_BINARY_INV)[1]
     
     # Strategy 3: Even higher for bright screens
-    _, thresh3 = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY_INV)
+    yield cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY_INV)[1]
     
     # Strategy 4: Otsu's method (adaptive to overall lighting)
-    _, thresh4 = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    yield cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
     
     # Strategy 5: Adaptive threshold Gaussian
-    thresh5 = cv2.adaptiveThreshold(
+    yield cv2.adaptiveThreshold(
         gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
         cv2.THRESH_BINARY_INV, 51, 15
     )
     
     # Strategy 6: Adaptive threshold Mean
-    thresh6 = cv2.adaptiveThreshold(
+    yield cv2.adaptiveThreshold(
         gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
         cv2.THRESH_BINARY_INV, 31, 12
     )
+
+
+def _detect_black_squares(image: np.ndarray) -> List[Tuple[float, float, float, float]]:
+    """
+    Detect solid black square markers using multiple strategies.
+    Returns list of (center_x, center_y, width, height) for each detected square.
+    
+    Strategies run in order and the sweep stops once the unique detections
+    cover all four corners. _classify_corners keeps the first detection per
+    corner, so detections from later strategies could not change its result.
+    """
+    height, width = image.shape[:2]
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    
+    # Unique detections, in discovery order. A marker found by several
+    # strategies is kept only the first time.
+    unique: List[Tuple[float, float, float, float]] = []
+    labels_seen = set()
+    
+    # Candidates must be darker than the image as a whole
+    darkness_limit = min(160, float(np.mean(gray)) * 0.85)
+    image_area = height * width
     
-    for thresh in [thresh1, thresh2, thresh3, thresh4, thresh5, thresh6]:
+    for thresh in _threshold_strategies(gray):
         # Morphological cleanup
-        kernel = np.ones((3, 3), np.uint8)
-        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel, iterations=2)
-        cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, kernel, iterations=1)
+        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, _MORPH_KERNEL_3, iterations=2)
+        cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_OPEN, _MORPH_KERNEL_3, iterations=1)
         
         contours, _ = cv2.findContours(cleaned, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        image_area = height * width
-        
+        candidates: List[Tuple[float, float, float, float]] = []
         for contour in contours:
             area = cv2.contourArea(contour)
             
@@ -88,88 +116,129 @@ def _detect_black_squares(image: np.ndarray) -> List[Tuple[float, float, float,
             if solidity < 0.6:  # More forgiving
                 continue
             
-            # Verify it's darker than average (relative check)
-            mask = np.zeros(gray.shape, dtype=np.uint8)
-            cv2.drawContours(mask, [contour], -1, 255, -1)
-            mean_val = cv2.mean(gray, mask=mask)[0]
+            # Verify it's darker than average (relative check). The contour
+            # is rasterized into a mask the size of its bounding box only.
+            mask = np.zeros((h, w), dtype=np.uint8)
+            cv2.drawContours(mask, [contour], -1, 255, -1, offset=(-x, -y))
+            mean_val = cv2.mean(gray[y:y + h, x:x + w], mask=mask)[0]
             # Compare to image mean - should be darker than average
-            img_mean = np.mean(gray)
-            if mean_val > min(160, img_mean * 0.85):  # Relative darkness check
+            if mean_val > darkness_limit:  # Relative darkness check
                 continue
             
             cx = x + w / 2.0
             cy = y + h / 2.0
-            detected.append((cx, cy, float(w), float(h)))
-    
-    # Remove duplicates (same marker found by multiple strategies)
-    unique = []
-    for det in detected:
-        is_dup = False
-        for exist in unique:
-            dist = ((det[0] - exist[0])**2 + (det[1] - exist[1])**2)**0.5
-            if dist < max(det[2], exist[2]) * 0.8:
-                is_dup = True
-                break
-        if not is_dup:
+            candidates.append((cx, cy, float(w), float(h)))
+        
+        # Remove duplicates (same marker found by multiple strategies)
+        for det in _dedup_detections(unique, candidates):
             unique.append(det)
+            labels_seen.add(_corner_label(det[0] / width, det[1] / height))
+        
+        if labels_seen >= _CORNER_LABELS:
+            break
     
     return unique
 
 
+def _dedup_detections(
+    unique: List[Tuple[float, float, float, float]],
+    candidates: List[Tuple[float, float, float, float]],
+) -> List[Tuple[float, float, float, float]]:
+    """
+    Return the candidates that duplicate neither ``unique`` nor an earlier candidate.
+    
+    Two detections are the same marker when their centers are closer than
+    0.8x the wider of the two. All pairwise squared distances come from one
+    NumPy broadcast; only the greedy keep/suppress walk stays in Python.
+    """
+    if not candidates:
+        return []
+    
+    arr = np.asarray(unique + candidates, dtype=np.float64)
+    dx = arr[:, None, 0] - arr[None, :, 0]
+    dy = arr[:, None, 1] - arr[None, :, 1]
+    limit = np.maximum(arr[:, None, 2], arr[None, :, 2]) * 0.8
+    # Compare squared distances so no square root is taken
+    close = dx * dx + dy * dy < limit * limit
+    
+    keep = np.zeros(len(arr), dtype=bool)
+    keep[:len(unique)] = True
+    for i in range(len(unique), len(arr)):
+        keep[i] = not (close[i] & keep).any()
+    return [det for det, kept in zip(candidates, keep[len(unique):]) if kept]
+
+
+def _corner_label(nx: float, ny: float) -> Optional[str]:
+    """Return the corner a normalized position falls in, or None."""
+    margin = _CORNER_MARGIN
+    if nx < margin and ny < margin:
+        return "tl"
+    if nx > (1 - margin) and ny < margin:
+        return "tr"
+    if nx < margin and ny > (1 - margin):
+        return "bl"
+    if nx > (1 - margin) and ny > (1 - margin):
+        return "br"
+    return None
+
+
 def _classify_corners(
     detections: List[Tuple[float, float, float, float]],
     width: int,
     height: int
-) -> Dict[str, Dict]:
-    """Classify detected squares into corner positions (tl, tr, bl, br)."""
-    corners: Dict[str, Dict] = {}
-    margin = 0.42  # Must be in outer 42% of image (more forgiving)
+) -> np.ndarray:
+    """
+    Classify detected squares into corner positions (tl, tr, bl, br).
+    
+    Returns a (4, 3) array of [cx, cy, size] rows in _CORNER_ORDER, with NaN
+    rows for corners that were not found.
+    """
+    corners = np.full((4, 3), np.nan)
     
-    logger.debug("Classifying %d detections in %dx%d image, margin=%.2f", len(detections), width, height, margin)
+    logger.debug("Classifying %d detections in %dx%d image, margin=%.2f", len(detections), width, height, _CORNER_MARGIN)
     
     for cx, cy, w, h in detections:
         nx, ny = cx / width, cy / height
         
-        label = None
-        if nx < margin and ny < margin:
-            label = "tl"
-        elif nx > (1 - margin) and ny < margin:
-            label = "tr"
-        elif nx < margin and ny > (1 - margin):
-            label = "bl"
-        elif nx > (1 - margin) and ny > (1 - margin):
-            label = "br"
-        else:
+        label = _corner_label(nx, ny)
+        if label is None:
             logger.debug("  Rejected: (%.2f, %.2f) - not in corner region", nx, ny)
+            continue
         
-        if label and label not in corners:
-            corners[label] = {"cx": cx, "cy": cy, "x": nx, "y": ny, "size": int((w + h) / 2)}
+        idx = _CORNER_INDEX[label]
+        if np.isnan(corners[idx, 0]):
+            corners[idx] = (cx, cy, int((w + h) / 2))
             logger.debug("  Assigned %s: (%.2f, %.2f)", label, nx, ny)
-        elif label:
+        else:
             logger.debug("  %s already assigned, skipping (%.2f, %.2f)", label, nx, ny)
     
     return corners
 
 
-def _compute_quality(corners: Dict[str, Dict]) -> float:
+def _corners_to_dict(corners: np.ndarray, width: int, height: int) -> Dict[str, Dict]:
+    """Serialize a corner array into the response's per-corner dicts."""
+    result: Dict[str, Dict] = {}
+    for label, (cx, cy, size) in zip(_CORNER_ORDER, corners.tolist()):
+        if cx == cx:  # not NaN
+            result[label] = {"cx": cx, "cy": cy, "x": cx / width, "y": cy / height, "size": int(size)}
+    return result
+
+
+def _compute_quality(corners: np.ndarray, width: int, height: int) -> float:
     """Compute alignment quality from 0-1."""
-    n = len(corners)
+    n = int(np.count_nonzero(~np.isnan(corners[:, 0])))
     if n == 0:
         return 0.0
     if n < 4:
         return n * 0.15  # Partial credit
     
-    # All 4 corners found - check geometry
-    tl = (corners["tl"]["x"], corners["tl"]["y"])
-    tr = (corners["tr"]["x"], corners["tr"]["y"])
-    bl = (corners["bl"]["x"], corners["bl"]["y"])
-    br = (corners["br"]["x"], corners["br"]["y"])
+    # All 4 corners found - check geometry on normalized positions
+    xy = corners[:, :2] / np.array([width, height], dtype=np.float64)
     
     # Check aspect ratio (should be ~0.87 for 1080x1240)
-    top_w = abs(tr[0] - tl[0])
-    bot_w = abs(br[0] - bl[0])
-    left_h = abs(bl[1] - tl[1])
-    right_h = abs(br[1] - tr[1])
+    top_w, bot_w, left_h, right_h = np.abs(
+        xy[[_TR, _BR, _BL, _BR], [0, 0, 1, 1]] - xy[[_TL, _BL, _TL, _TR], [0, 0, 1, 1]]
+    ).tolist()
     
     avg_w = (top_w + bot_w) / 2
     avg_h = (left_h + right_h) / 2
@@ -206,26 +275,24 @@ async def validate_fiducials(file: UploadFile = File(...)) -> dict:
     payload = await file.read()
     
     try:
-        with Image.open(BytesIO(payload)) as pil_img:
-            pil_img = ImageOps.exif_transpose(pil_img)
-            pil_img = pil_img.convert("RGB")
-            
-            # Resize for speed (640px is plenty for corner detection)
-            max_dim = 640
-            if max(pil_img.size) > max_dim:
-                ratio = max_dim / max(pil_img.size)
-                new_size = (int(pil_img.width * ratio), int(pil_img.height * ratio))
-                pil_img = pil_img.resize(new_size, Image.Resampling.LANCZOS)
-            
-            image = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+        # cv2.imdecode applies EXIF orientation; PIL is only a format fallback
+        image = decode_bgr(payload)
+        
+        # Resize for speed (640px is plenty for corner detection)
+        max_dim = 640
+        h, w = image.shape[:2]
+        if max(h, w) > max_dim:
+            ratio = max_dim / max(h, w)
+            image = cv2.resize(image, (int(w * ratio), int(h * ratio)), interpolation=cv2.INTER_AREA)
     except Exception as exc:
         logger.exception("Image decode failed")
         raise HTTPException(status_code=400, detail="Cannot decode image") from exc
     
     h, w = image.shape[:2]
     detections = _detect_black_squares(image)
-    corners = _classify_corners(detections, w, h)
-    quality = _compute_quality(corners)
+    corner_array = _classify_corners(detections, w, h)
+    quality = _compute_quality(corner_array, w, h)
+    corners = _corners_to_dict(corner_array, w, h)
     
     detected = len(corners)
     ready = detected == 4 and quality >= 0.6
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from datetime import datetime
-from io import BytesIO
 from pathlib import Path
+from typing import Optional
 
 import cv2
 import numpy as np
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from fastapi.responses import Response
-from PIL import Image, ImageOps
 
 from app.services.ocr import EasyOCRService, get_ocr_service
 
@@ -26,6 +26,36 @@ from app.ml.inference import (
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Capture saves still running on the default executor; holding the futures
+# keeps them referenced until _on_capture_saved has checked their outcome
+_PENDING_SAVES: "set[asyncio.Future]" = set()
+
+
+def _save_capture(payload: bytes, filename: Optional[str]) -> None:
+    """Write an upload to the capture dir and point ``latest`` at it."""
+    try:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        ext = Path(filename).suffix if filename else ".png"
+        capture_path = CAPTURE_SAVE_DIR / f"capture_{timestamp}{ext}"
+        capture_path.write_bytes(payload)
+        # Also save as "latest" for easy access; a hard link avoids writing
+        # the same bytes twice where the filesystem supports it
+        latest_path = CAPTURE_SAVE_DIR / f"latest{ext}"
+        latest_path.unlink(missing_ok=True)
+        try:
+            os.link(capture_path, latest_path)
+        except OSError:
+            latest_path.write_bytes(payload)
+        logger.info("Saved capture to: %s", capture_path)
+    except Exception as e:
+        logger.warning("Failed to save capture for debugging: %s", e)
+
+
+def _on_capture_saved(future: asyncio.Future) -> None:
+    _PENDING_SAVES.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Capture save task failed", exc_info=future.exception())
+
 
 @router.post("/data-card")
 async def parse_data_card(
@@ -43,18 +73,12 @@ async def parse_data_card(
         len(payload),
     )
     
-    # Save capture for debugging (always save latest)
-    try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        ext = Path(file.filename).suffix if file.filename else ".png"
-        capture_path = CAPTURE_SAVE_DIR / f"capture_{timestamp}{ext}"
-        capture_path.write_bytes(payload)
-        # Also save as "latest" for easy access
-        latest_path = CAPTURE_SAVE_DIR / f"latest{ext}"
-        latest_path.write_bytes(payload)
-        logger.info("Saved capture to: %s", capture_path)
-    except Exception as e:
-        logger.warning("Failed to save capture for debugging: %s", e)
+    # Save capture for debugging (always save latest) on a worker thread, off
+    # the request's critical path. Unlike a BackgroundTask this runs even when
+    # OCR fails, and those uploads are the ones most worth keeping.
+    save = asyncio.get_running_loop().run_in_executor(None, _save_capture, payload, file.filename)
+    _PENDING_SAVES.add(save)
+    save.add_done_callback(_on_capture_saved)
     
     try:
         parsed = ocr_service.read_fixed_form_values(payload)
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.responses import Response
 
-from app.schemas.schemas import PotabilityResponse, WaterSamplePayload
+from app.schemas.schemas import ParameterCheck, PotabilityResponse, WaterSamplePayload
 from app.services.potability import get_potability_predictor
 
 
@@ -8,10 +9,26 @@ router = APIRouter()
 
 
 @router.post("/potability", response_model=PotabilityResponse)
-def run_potability_checks(payload: WaterSamplePayload) -> PotabilityResponse:
+def run_potability_checks(payload: WaterSamplePayload, background_tasks: BackgroundTasks) -> Response:
+	"""Score a water sample and queue its Supabase write.
+
+	Only the request body is untrusted and gets validated. The response is
+	built by score_sample itself, so it is assembled with model_construct and
+	serialized without a second validation pass; response_model stays for the
+	OpenAPI schema.
+	"""
 	predictor = get_potability_predictor()
+	features = payload.feature_dict()
+	meta = payload.meta_dict()
 	try:
-		result = predictor.score_sample(payload.feature_dict(), payload.meta_dict())
+		result = predictor.score_sample(features, meta, defer_persist=True)
 	except ValueError as exc:
 		raise HTTPException(status_code=400, detail=str(exc)) from exc
-	return PotabilityResponse.parse_obj(result)
+	# Save to Supabase once the response is sent; the response reports the
+	# write as queued, not saved
+	if result["queued"]:
+		background_tasks.add_task(predictor.persist_sample, features, meta, result)
+	response = PotabilityResponse.model_construct(
+		**{**result, "checks": [ParameterCheck.model_construct(**check) for check in result["checks"]]}
+	)
+	return Response(content=response.model_dump_json(by_alias=True), media_type="application/json")
@@ -1,9 +1,27 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+# WaterSamplePayload fields handed to the predictor as readings and metadata
+_FEATURE_KEYS = (
+    "ph",
+    "hardness",
+    "solids",
+    "chloramines",
+    "sulfate",
+    "conductivity",
+    "organic_carbon",
+    "trihalomethanes",
+    "turbidity",
+    "free_chlorine_residual",
+)
+_META_KEYS = ("color", "source", "sample_label", "user_id", "notes")
+
+# Input keys (field names and aliases) of WaterSamplePayload's free-text fields
+_TEXT_KEYS = ("color", "source", "sample_label", "sampleLabel", "user_id", "userId", "notes")
 
 
 class WaterSamplePayload(BaseModel):
@@ -25,43 +43,30 @@ class WaterSamplePayload(BaseModel):
     user_id: Optional[str] = Field(None, alias="userId")
     notes: Optional[str] = None
 
-    @validator(
-        "color",
-        "source",
-        "sample_label",
-        "user_id",
-        "notes",
-        pre=True,
-        always=True,
-    )
-    def _empty_to_none(cls, value: Optional[str]) -> Optional[str]:  # noqa: N805
-        if value is None:
-            return None
-        value = str(value).strip()
-        return value or None
+    @model_validator(mode="before")
+    @classmethod
+    def _empty_to_none(cls, data: Any) -> Any:
+        # One pass over the raw input for every free-text field, under either
+        # its name or its alias
+        if not isinstance(data, dict):
+            return data
+        cleaned = None
+        for key in _TEXT_KEYS:
+            value = data.get(key)
+            if value is None:
+                continue
+            if cleaned is None:
+                cleaned = dict(data)
+            cleaned[key] = str(value).strip() or None
+        return data if cleaned is None else cleaned
 
     def feature_dict(self) -> Dict[str, Optional[float]]:
-        return {
-            "ph": self.ph,
-            "hardness": self.hardness,
-            "solids": self.solids,
-            "chloramines": self.chloramines,
-            "sulfate": self.sulfate,
-            "conductivity": self.conductivity,
-            "organic_carbon": self.organic_carbon,
-            "trihalomethanes": self.trihalomethanes,
-            "turbidity": self.turbidity,
-            "free_chlorine_residual": self.free_chlorine_residual,
-        }
+        values = self.__dict__
+        return {key: values[key] for key in _FEATURE_KEYS}
 
     def meta_dict(self) -> Dict[str, Optional[str]]:
-        return {
-            "color": self.color,
-            "source": self.source,
-            "sample_label": self.sample_label,
-            "user_id": self.user_id,
-            "notes": self.notes,
-        }
+        values = self.__dict__
+        return {key: values[key] for key in _META_KEYS}
 
 
 class ParameterCheck(BaseModel):
@@ -86,6 +91,7 @@ class PotabilityResponse(BaseModel):
     missing_features: List[str] = Field(..., alias="missingFeatures")
     meta: Dict[str, Optional[str]]
     saved: bool
+    queued: bool = False
     sample_id: Optional[str] = Field(None, alias="sampleId")
     message: str
 
@@ -1,13 +1,12 @@
 import logging
-from functools import lru_cache
-from io import BytesIO
-from typing import Dict, Iterable, List, Optional, Sequence
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import cv2
-import easyocr
 import numpy as np
-from PIL import Image, ImageFilter, ImageOps
 
+from app.core.config import get_settings
+from app.ml.imaging import decode_bgr, get_clahe
 from app.ml.inference import EXTRACTOR
 
 
@@ -16,19 +15,67 @@ logger = logging.getLogger(__name__)
 
 Detection = dict
 
-_RESAMPLING_FILTER = Image.Resampling.LANCZOS if hasattr(Image, "Resampling") else Image.LANCZOS
+# Decoded uploads are contrast-stretched (clipping this percentage at each
+# end) and capped to this longest edge
+_AUTOCONTRAST_CUTOFF = 2
+_MAX_EDGE = 2200
+
+# Structuring element for closing gaps in the thresholded text
+_CLOSE_KERNEL = np.ones((3, 3), np.uint8)
+
+# Per-thread GPU CLAHE for _equalize_and_denoise_cuda, the counterpart of
+# imaging.get_clahe on the CPU path
+_CUDA_CLAHE_LOCAL = threading.local()
+
+# Text boxes recognized per forward pass in read_text
+_RECOGNIZE_BATCH_SIZE = 16
+
+# Side of the thumbnail the clean-input gate measures
+_GATE_THUMBNAIL_SIZE = 256
 
 
 class EasyOCRService:
     """Thin wrapper around EasyOCR so it can be dependency-injected."""
 
     def __init__(self, languages: Optional[Sequence[str]] = None, gpu: bool = False) -> None:
+        # Imported here: easyocr pulls in torch, which dominates import time
+        import easyocr
+
         self._reader = easyocr.Reader(list(languages or ("en",)), gpu=gpu)
+        settings = get_settings()
+        self._canonical_detection = settings.ocr_canonical_detection
+        self._clean_gate = settings.ocr_clean_gate
+        self._clean_min_laplacian_var = settings.ocr_clean_min_laplacian_var
+        self._clean_min_std = settings.ocr_clean_min_std
+        self._equalize_min_std = settings.ocr_equalize_min_std
+        # Run the contrast/denoise stage on the GPU too when OpenCV has CUDA
+        self._use_cuda = gpu and _cuda_available() and _cuda_preprocess_works()
+        if self._use_cuda:
+            logger.info("OpenCV CUDA preprocessing enabled")
 
     def read_text(self, image_bytes: bytes) -> List[Detection]:
         image = _bytes_to_image(image_bytes)
-        preprocessed = _preprocess_image(image)
-        easyocr_results = self._reader.readtext(preprocessed)
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if self._clean_gate else None
+        if gray is not None and _is_clean_image(gray, self._clean_min_laplacian_var, self._clean_min_std):
+            # Sharp, high-contrast input (e.g. a screenshot): the cleanup
+            # pipeline costs more than it helps
+            logger.debug("Clean input, skipping OCR preprocessing")
+            preprocessed = gray
+        else:
+            preprocessed = _preprocess_image(
+                image, equalize_min_std=self._equalize_min_std, use_cuda=self._use_cuda
+            )
+        # Detect once, then push every box through the recognizer in batches
+        # instead of readtext's default one-box-at-a-time recognition
+        horizontal_list, free_list = self._reader.detect(preprocessed)
+        if not horizontal_list[0] and not free_list[0]:
+            return []
+        easyocr_results = self._reader.recognize(
+            preprocessed,
+            horizontal_list=horizontal_list[0],
+            free_list=free_list[0],
+            batch_size=_RECOGNIZE_BATCH_SIZE,
+        )
         detections = [
             {
                 "bbox": [[float(coord) for coord in point] for point in bbox],
@@ -39,27 +86,65 @@ class EasyOCRService:
         ]
         return detections
 
+    def warmup(self) -> None:
+        """Run one dummy fixed-form batch so the first request skips model warm-up."""
+        EXTRACTOR.warmup(self._reader, canonical_detection=self._canonical_detection)
+
     def read_fixed_form_values(self, image_bytes: bytes) -> Dict[str, Optional[str]]:
         logger.info("Fixed-form OCR extractor invoked")
-        return EXTRACTOR.extract(image_bytes, self._reader)
+        return EXTRACTOR.extract(image_bytes, self._reader, canonical_detection=self._canonical_detection)
 
 
 def _bytes_to_image(image_bytes: bytes) -> np.ndarray:
     try:
-        with Image.open(BytesIO(image_bytes)) as pil_img:
-            pil_img = ImageOps.exif_transpose(pil_img)
-            pil_img = pil_img.convert("RGB")
-            pil_img = ImageOps.autocontrast(pil_img, cutoff=2)
-            pil_img = pil_img.filter(ImageFilter.MedianFilter(size=3))
-            max_edge = 2200
-            if max(pil_img.size) > max_edge:
-                pil_img.thumbnail((max_edge, max_edge), _RESAMPLING_FILTER)
-            image = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+        # imdecode applies the EXIF orientation and yields BGR directly
+        image = decode_bgr(image_bytes)
     except Exception as exc:  # pragma: no cover - defensive guard
         raise ValueError("Unable to decode image for OCR processing") from exc
+    if image is None or image.size == 0:
+        raise ValueError("Unable to decode image for OCR processing")
+    image = _autocontrast(image, _AUTOCONTRAST_CUTOFF)
+    image = cv2.medianBlur(image, 3)
+    height, width = image.shape[:2]
+    if max(height, width) > _MAX_EDGE:
+        scale = _MAX_EDGE / max(height, width)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
     return image
 
 
+def _autocontrast(image: np.ndarray, cutoff: float) -> np.ndarray:
+    """
+    Per-channel contrast stretch, as ImageOps.autocontrast(cutoff=...).
+    
+    ``cutoff`` percent of the pixels are clipped at each end of every
+    channel's histogram and the remaining range is mapped onto 0..255
+    with a single lookup table pass.
+    """
+    ramp = np.arange(256, dtype=np.float64)
+    luts = []
+    for channel in range(image.shape[2]):
+        hist = cv2.calcHist([image], [channel], None, [256], [0, 256]).ravel()
+        cut = hist.sum() * cutoff // 100
+        lo = int(np.searchsorted(np.cumsum(hist), cut, side="right"))
+        hi = 255 - int(np.searchsorted(np.cumsum(hist[::-1]), cut, side="right"))
+        if hi <= lo:
+            luts.append(ramp)
+            continue
+        scale = 255.0 / (hi - lo)
+        luts.append(np.trunc(ramp * scale - lo * scale))
+    lut = np.clip(np.stack(luts, axis=-1), 0, 255).astype(np.uint8)
+    return cv2.LUT(image, lut.reshape(1, 256, -1))
+
+
+def _is_clean_image(gray: np.ndarray, min_laplacian_var: float, min_std: float) -> bool:
+    """Cheap sharpness/contrast check on a thumbnail of ``gray``."""
+    thumbnail = cv2.resize(gray, (_GATE_THUMBNAIL_SIZE, _GATE_THUMBNAIL_SIZE), interpolation=cv2.INTER_AREA)
+    if float(thumbnail.std()) <= min_std:
+        return False
+    return float(cv2.Laplacian(thumbnail, cv2.CV_64F).var()) > min_laplacian_var
+
+
 def _deskew_image(image: np.ndarray) -> np.ndarray:
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     gray = cv2.bitwise_not(gray)
@@ -82,12 +167,75 @@ def _deskew_image(image: np.ndarray) -> np.ndarray:
     return rotated
 
 
-def _preprocess_image(image: np.ndarray) -> np.ndarray:
+def _cuda_available() -> bool:
+    """True if this OpenCV build has CUDA support and sees a device."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def _cuda_preprocess_works() -> bool:
+    """Smoke-test the CUDA preprocessing stage once, so a broken build is caught at startup."""
+    probe = np.zeros((64, 64), dtype=np.uint8)
+    try:
+        for use_global in (True, False):
+            _equalize_and_denoise_cuda(probe, use_global)
+    except (AttributeError, cv2.error):
+        logger.warning("OpenCV CUDA preprocessing unavailable; using the CPU path", exc_info=True)
+        return False
+    return True
+
+
+def _get_cuda_clahe() -> "cv2.cuda.CLAHE":
+    """Return this thread's GPU CLAHE instance (clip 2.0, 8x8 tiles)."""
+    clahe = getattr(_CUDA_CLAHE_LOCAL, "clahe", None)
+    if clahe is None:
+        clahe = _CUDA_CLAHE_LOCAL.clahe = cv2.cuda.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    return clahe
+
+
+def _equalize_and_denoise(gray: np.ndarray, use_global: bool) -> np.ndarray:
+    """Equalize + bilateral stage of _preprocess_image."""
+    if use_global:
+        equalized = cv2.equalizeHist(gray)
+    else:
+        # CLAHE objects keep scratch state, so reuse one per thread
+        equalized = get_clahe(2.0).apply(gray)
+    return cv2.bilateralFilter(equalized, d=5, sigmaColor=60, sigmaSpace=60)
+
+
+def _equalize_and_denoise_cuda(gray: np.ndarray, use_global: bool) -> np.ndarray:
+    """GPU version of the equalize + bilateral stage of _preprocess_image."""
+    gpu_gray = cv2.cuda_GpuMat()
+    gpu_gray.upload(gray)
+    if use_global:
+        gpu_equalized = cv2.cuda.equalizeHist(gpu_gray)
+    else:
+        gpu_equalized = _get_cuda_clahe().apply(gpu_gray, cv2.cuda.Stream_Null())
+    return cv2.cuda.bilateralFilter(gpu_equalized, 5, 60, 60).download()
+
+
+def _preprocess_image(
+    image: np.ndarray,
+    equalize_min_std: Optional[float] = None,
+    use_cuda: bool = False,
+) -> np.ndarray:
     aligned = _deskew_image(image)
     gray = cv2.cvtColor(aligned, cv2.COLOR_BGR2GRAY)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    equalized = clahe.apply(gray)
-    denoised = cv2.bilateralFilter(equalized, d=5, sigmaColor=60, sigmaSpace=60)
+    # CLAHE costs the same for any tile grid; an image that is already
+    # contrasty only needs the (~6x cheaper) global equalization
+    use_global = equalize_min_std is not None and float(cv2.meanStdDev(gray)[1][0, 0]) >= equalize_min_std
+    denoised = None
+    if use_cuda:
+        # adaptiveThreshold has no CUDA counterpart, so only the
+        # equalize + bilateral stage moves to the GPU
+        try:
+            denoised = _equalize_and_denoise_cuda(gray, use_global)
+        except cv2.error:
+            logger.warning("CUDA preprocessing failed; falling back to the CPU path", exc_info=True)
+    if denoised is None:
+        denoised = _equalize_and_denoise(gray, use_global)
     thresh = cv2.adaptiveThreshold(
         denoised,
         255,
@@ -96,8 +244,9 @@ def _preprocess_image(image: np.ndarray) -> np.ndarray:
         35,
         5,
     )
-    closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))
-    processed = cv2.cvtColor(closed, cv2.COLOR_GRAY2BGR)
+    # EasyOCR accepts single-channel input, so stay gray and upscale one
+    # channel instead of three
+    processed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, _CLOSE_KERNEL)
     target_width = 1400
     height, width = processed.shape[:2]
     if width < target_width:
@@ -106,7 +255,18 @@ def _preprocess_image(image: np.ndarray) -> np.ndarray:
     return processed
 
 
-@lru_cache(maxsize=1)
+# One service per (languages, gpu) configuration; building a Reader loads the
+# model weights, so concurrent first requests must not build it twice
+_SERVICES: Dict[Tuple[Tuple[str, ...], bool], EasyOCRService] = {}
+_SERVICES_LOCK = threading.Lock()
+
+
 def get_ocr_service(languages: Optional[Iterable[str]] = None, gpu: bool = False) -> EasyOCRService:
-    # Languages/gpu parameters only matter on first call because of lru_cache.
-    return EasyOCRService(languages=languages or ("en",), gpu=gpu)
+    key = (tuple(languages or ("en",)), bool(gpu))
+    service = _SERVICES.get(key)
+    if service is None:
+        with _SERVICES_LOCK:
+            service = _SERVICES.get(key)
+            if service is None:
+                service = _SERVICES[key] = EasyOCRService(languages=key[0], gpu=key[1])
+    return service
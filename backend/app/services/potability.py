@@ -1,22 +1,28 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from importlib.metadata import version
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.impute import SimpleImputer
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
 
 from app.core.config import get_settings
 from app.services.supabase_client import get_supabase_client
 
+# pandas, scikit-learn and joblib are imported where they are used, so
+# importing this module (and the app) does not pay for them up front
+if TYPE_CHECKING:
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+
 logger = logging.getLogger(__name__)
 
 # NOTE: Temporarily excluding "free_chlorine_residual" until dataset is available.
@@ -97,12 +103,177 @@ class PotabilityPredictor:
         self.threshold = threshold
         self.settings = get_settings()
         self.samples_table = (self.settings.supabase_samples_table or "").strip()
-        self.pipeline = self._train_pipeline()
-        self.feature_stats = self._compute_feature_stats()
         self.model_version = "random_forest_v1"
+        self._model_cache_path = self._cache_path()
+        self.pipeline, self.feature_stats = self._load_or_train()
+        self._prepare_inference()
+        # Per-feature stats in FEATURE_COLUMNS order for the vectorized checks
+        self._mean = np.array([self.feature_stats[col]["mean"] for col in FEATURE_COLUMNS])
+        self._std = np.array([self.feature_stats[col]["std"] or 1e-9 for col in FEATURE_COLUMNS])
+        self._labels = [FIELD_LABELS.get(col, col) for col in FEATURE_COLUMNS]
+        self._ranges = [self._recommended_range(self.feature_stats[col]) for col in FEATURE_COLUMNS]
+        # Scratch rows reused by score_sample; sync routes run on a thread
+        # pool, so each worker thread gets its own
+        self._scratch = threading.local()
+
+    def _prepare_inference(self) -> None:
+        """Pull the fitted transform parameters out of the pipeline for single-row scoring."""
+        imputer = self.pipeline.named_steps["imputer"]
+        scaler = self.pipeline.named_steps["scaler"]
+        model = self.pipeline.named_steps["model"]
+        # One row never benefits from the training-time thread pool
+        model.n_jobs = 1
+        self._impute_values = np.asarray(imputer.statistics_, dtype=np.float64)
+        self._scaler_mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self._scaler_scale = np.asarray(scaler.scale_, dtype=np.float64)
+        self._trees = list(model.estimators_)
+        self._n_classes = int(model.n_classes_)
+        # SimpleImputer drops all-NaN training columns; only then do the
+        # manual transforms not line up with FEATURE_COLUMNS
+        self._fast_predict = (
+            self._impute_values.shape == (len(FEATURE_COLUMNS),)
+            and bool(np.isfinite(self._impute_values).all())
+        )
+        self._onnx_session = self._load_onnx_session(model) if self._fast_predict else None
+        if self._onnx_session is not None:
+            self._onnx_input = self._onnx_session.get_inputs()[0].name
+            self._onnx_output = self._onnx_session.get_outputs()[-1].name
+            logger.info("Scoring potability samples with ONNX Runtime")
+        else:
+            logger.info("Scoring potability samples with scikit-learn")
+
+    def _load_onnx_session(self, model: RandomForestClassifier) -> Optional["onnxruntime.InferenceSession"]:
+        """
+        Build a single-threaded ONNX Runtime session for the fitted forest.
+
+        onnxruntime and skl2onnx are optional (requirements-onnx.txt);
+        without them, or if conversion fails, None is returned and scoring
+        stays on the sklearn trees.
+        """
+        try:
+            import onnxruntime
+            import skl2onnx  # noqa: F401 - its version is part of the cache key
+        except ImportError:
+            return None
+
+        # The converted graph depends on the converter and the runtime that loads it
+        onnx_path = self._model_cache_path.with_name(
+            f"{self._model_cache_path.stem}_skl2onnx{version('skl2onnx')}_ort{version('onnxruntime')}.onnx"
+        )
+        try:
+            if onnx_path.exists():
+                model_bytes = onnx_path.read_bytes()
+            else:
+                from skl2onnx import convert_sklearn
+                from skl2onnx.common.data_types import FloatTensorType
+
+                onnx_model = convert_sklearn(
+                    model,
+                    initial_types=[("input", FloatTensorType([None, len(FEATURE_COLUMNS)]))],
+                    options={id(model): {"zipmap": False}},
+                )
+                model_bytes = onnx_model.SerializeToString()
+                try:
+                    tmp_path = onnx_path.with_suffix(".onnx.tmp")
+                    tmp_path.write_bytes(model_bytes)
+                    os.replace(tmp_path, onnx_path)
+                except OSError:
+                    logger.warning("Failed to cache ONNX potability model at %s", onnx_path, exc_info=True)
+
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = 1
+            options.inter_op_num_threads = 1
+            return onnxruntime.InferenceSession(
+                model_bytes, sess_options=options, providers=["CPUExecutionProvider"]
+            )
+        except Exception:
+            logger.warning("ONNX Runtime unavailable for potability scoring; using sklearn", exc_info=True)
+            return None
+
+    def _scratch_rows(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return this thread's (readings, scaled row, float32 model input) buffers."""
+        rows = getattr(self._scratch, "rows", None)
+        if rows is None:
+            n_features = len(FEATURE_COLUMNS)
+            rows = self._scratch.rows = (
+                np.empty(n_features, dtype=np.float64),
+                np.empty(n_features, dtype=np.float64),
+                np.empty((1, n_features), dtype=np.float32),
+            )
+        return rows
+
+    def _predict_probability(self, values: np.ndarray) -> float:
+        """Potable-class probability for one row of readings in FEATURE_COLUMNS order (NaN if missing)."""
+        if not self._fast_predict:
+            import pandas as pd
+
+            frame = pd.DataFrame(values[np.newaxis, :], columns=list(FEATURE_COLUMNS))
+            return float(self.pipeline.predict_proba(frame)[0][1])
+
+        # Same steps as the pipeline (median impute, standardize, average the
+        # trees) without sklearn's per-call validation and joblib dispatch
+        _, row, X = self._scratch_rows()
+        np.copyto(row, values)
+        np.copyto(row, self._impute_values, where=np.isnan(values))
+        row -= self._scaler_mean
+        row /= self._scaler_scale
+        X[0] = row
+        if self._onnx_session is not None:
+            probabilities = self._onnx_session.run([self._onnx_output], {self._onnx_input: X})[0]
+            return float(probabilities[0][1])
+        proba = np.zeros(self._n_classes, dtype=np.float64)
+        for tree in self._trees:
+            proba += tree.predict_proba(X, check_input=False)[0]
+        proba /= len(self._trees)
+        return float(proba[1])
+
+    def _cache_path(self) -> Path:
+        digest = hashlib.sha256(self.dataset_path.read_bytes()).hexdigest()[:16]
+        # Deep params carry every step's hyperparameters as step__name; the
+        # step objects themselves are skipped
+        params = sorted(
+            (name, repr(value))
+            for name, value in self._build_pipeline().get_params(deep=True).items()
+            if not hasattr(value, "get_params") and name != "steps"
+        )
+        params_digest = hashlib.sha256(repr(params).encode("utf-8")).hexdigest()[:12]
+        return Path(self.settings.model_cache_dir) / (
+            f"potability_{self.model_version}_sklearn{version('scikit-learn')}_{digest}_{params_digest}.joblib"
+        )
+
+    def _load_or_train(self) -> Tuple[Pipeline, Dict[str, Dict[str, float]]]:
+        """Load the fitted pipeline and feature stats from disk, training them on a cache miss."""
+        import joblib
+
+        cache_path = self._model_cache_path
+        if cache_path.exists():
+            try:
+                pipeline, stats = joblib.load(cache_path)
+                logger.info("Loaded potability model from %s", cache_path)
+                return pipeline, stats
+            except Exception:
+                logger.warning("Ignoring unreadable potability model cache %s", cache_path, exc_info=True)
+
+        df = self._load_training_frame()
+        pipeline = self._train_pipeline(df)
+        stats = self._compute_feature_stats(df)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            joblib.dump((pipeline, stats), tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            logger.warning("Failed to cache potability model at %s", cache_path, exc_info=True)
+        return pipeline, stats
 
     def _load_training_frame(self) -> pd.DataFrame:
-        df = pd.read_csv(self.dataset_path)
+        import pandas as pd
+
+        # Every reading column is numeric; declaring it skips dtype inference
+        df = pd.read_csv(
+            self.dataset_path,
+            dtype={src: "float64" for src, dst in COLUMN_MAP.items() if dst in FEATURE_COLUMNS},
+        )
         missing = [src for src in COLUMN_MAP if src not in df.columns]
         if missing:
             raise ValueError(f"Dataset missing expected columns: {', '.join(missing)}")
@@ -113,11 +284,14 @@ class PotabilityPredictor:
         df = df[list(FEATURE_COLUMNS) + ["is_potable"]]
         return df
 
-    def _train_pipeline(self) -> Pipeline:
-        df = self._load_training_frame()
-        X = df[list(FEATURE_COLUMNS)]
-        y = df["is_potable"].fillna(0)
-        pipeline = Pipeline(
+    def _build_pipeline(self) -> Pipeline:
+        """Return the unfitted pipeline; its parameters are part of the model cache key."""
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.impute import SimpleImputer
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+
+        return Pipeline(
             steps=[
                 ("imputer", SimpleImputer(strategy="median")),
                 ("scaler", StandardScaler()),  # Kept for consistency; RF is scale-invariant
@@ -137,11 +311,19 @@ class PotabilityPredictor:
                 ),
             ]
         )
+
+    def _train_pipeline(self, df: Optional[pd.DataFrame] = None) -> Pipeline:
+        if df is None:
+            df = self._load_training_frame()
+        X = df[list(FEATURE_COLUMNS)]
+        y = df["is_potable"].fillna(0)
+        pipeline = self._build_pipeline()
         pipeline.fit(X, y)
         return pipeline
 
-    def _compute_feature_stats(self) -> Dict[str, Dict[str, float]]:
-        df = self._load_training_frame()
+    def _compute_feature_stats(self, df: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, float]]:
+        if df is None:
+            df = self._load_training_frame()
         stats: Dict[str, Dict[str, float]] = {}
         for column in FEATURE_COLUMNS:
             series = df[column].dropna()
@@ -169,20 +351,28 @@ class PotabilityPredictor:
         self,
         features: Dict[str, Optional[float]],
         meta: Optional[Dict[str, Optional[str]]] = None,
+        *,
+        defer_persist: bool = False,
     ) -> Dict[str, object]:
+        """
+        Score one sample and save it to Supabase when configured.
+
+        With ``defer_persist`` nothing is written here: the result is marked
+        ``queued`` and the caller is expected to run ``persist_sample`` later
+        (e.g. as a background task once the response is sent).
+        """
         provided = [value for value in features.values() if value is not None]
         if len(provided) < 3:
             raise ValueError("At least three numeric parameters are required for a stable prediction.")
 
-        row = {}
-        for col in FEATURE_COLUMNS:
+        values = self._scratch_rows()[0]
+        for idx, col in enumerate(FEATURE_COLUMNS):
             value = features.get(col)
-            row[col] = np.nan if value is None else float(value)
-        frame = pd.DataFrame([row])
-        probability = float(self.pipeline.predict_proba(frame)[0][1])
+            values[idx] = np.nan if value is None else float(value)
+        probability = self._predict_probability(values)
         is_potable = probability >= self.threshold
         risk_level = self._derive_risk(probability)
-        checks = [self._build_check(col, features.get(col)) for col in FEATURE_COLUMNS]
+        checks = self._build_checks(features, values)
 
         result = {
             "is_potable": is_potable,
@@ -194,11 +384,16 @@ class PotabilityPredictor:
             "missing_features": [col for col in FEATURE_COLUMNS if features.get(col) is None],
             "meta": meta or {},
             "saved": False,
+            "queued": False,
             "sample_id": None,
             "message": self._build_summary(is_potable, risk_level),
         }
 
-        sample_id = self._persist_sample(features, meta or {}, result)
+        if defer_persist:
+            result["queued"] = self._can_persist()
+            return result
+
+        sample_id = self.persist_sample(features, meta or {}, result)
         if sample_id:
             result["saved"] = True
             result["sample_id"] = sample_id
@@ -222,40 +417,47 @@ class PotabilityPredictor:
             return "Sample trends toward non-potable; investigate highlighted parameters."
         return "Sample is likely non-potable; escalate for confirmatory testing."
 
-    def _build_check(self, field: str, value: Optional[float]) -> ParameterCheck:
-        stats = self.feature_stats[field]
-        label = FIELD_LABELS.get(field, field)
-        if value is None:
-            return ParameterCheck(
-                field=field,
-                label=label,
-                value=None,
-                status="missing",
-                detail="No reading captured.",
-                z_score=None,
-                recommended_range=self._recommended_range(stats),
-            )
+    def _build_checks(self, features: Dict[str, Optional[float]], values: np.ndarray) -> List[ParameterCheck]:
+        """Build one check per feature; ``values`` holds the readings in FEATURE_COLUMNS order (NaN if missing)."""
+        z_scores = (values - self._mean) / self._std
+        magnitudes = np.abs(z_scores)
+        severities = np.where(magnitudes >= 2.5, "critical", np.where(magnitudes >= 1.5, "warning", "ok"))
+
+        checks: List[ParameterCheck] = []
+        for idx, field in enumerate(FEATURE_COLUMNS):
+            label = self._labels[idx]
+            recommended_range = self._ranges[idx]
+            if recommended_range is not None:
+                recommended_range = list(recommended_range)
+            if features.get(field) is None:
+                checks.append(
+                    ParameterCheck(
+                        field=field,
+                        label=label,
+                        value=None,
+                        status="missing",
+                        detail="No reading captured.",
+                        z_score=None,
+                        recommended_range=recommended_range,
+                    )
+                )
+                continue
 
-        std = stats["std"] or 1e-9
-        z_score = (value - stats["mean"]) / std
-        severity = "ok"
-        if abs(z_score) >= 2.5:
-            severity = "critical"
-        elif abs(z_score) >= 1.5:
-            severity = "warning"
-
-        direction = "above" if z_score > 0 else "below"
-        detail = f"{label} is {abs(z_score):.1f}σ {direction} the dataset mean."
-
-        return ParameterCheck(
-            field=field,
-            label=label,
-            value=float(value),
-            status=severity,
-            detail=detail,
-            z_score=float(z_score),
-            recommended_range=self._recommended_range(stats),
-        )
+            z_score = float(z_scores[idx])
+            direction = "above" if z_score > 0 else "below"
+            detail = f"{label} is {float(magnitudes[idx]):.1f}σ {direction} the dataset mean."
+            checks.append(
+                ParameterCheck(
+                    field=field,
+                    label=label,
+                    value=float(values[idx]),
+                    status=str(severities[idx]),
+                    detail=detail,
+                    z_score=z_score,
+                    recommended_range=recommended_range,
+                )
+            )
+        return checks
 
     @staticmethod
     def _recommended_range(stats: Dict[str, Optional[float]]) -> Optional[List[float]]:
@@ -267,12 +469,16 @@ class PotabilityPredictor:
             return None
         return [float(low), float(high)]
 
-    def _persist_sample(
+    def _can_persist(self) -> bool:
+        return bool(self.samples_table) and get_supabase_client() is not None
+
+    def persist_sample(
         self,
         features: Dict[str, Optional[float]],
         meta: Dict[str, Optional[str]],
         result: Dict[str, object],
     ) -> Optional[str]:
+        """Insert the scored sample and return the id Supabase assigned, if any."""
         client = get_supabase_client()
         if not client or not self.samples_table:
             return None
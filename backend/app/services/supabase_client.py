@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import logging
 from functools import lru_cache
-from typing import Optional
-
-from supabase import Client, create_client
+from typing import TYPE_CHECKING, Optional
 
 from app.core.config import get_settings
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +21,9 @@ def get_supabase_client() -> Optional[Client]:
         return None
 
     try:
+        # Imported here so apps without Supabase credentials never load it
+        from supabase import create_client
+
         return create_client(settings.supabase_url, settings.supabase_service_key)
     except Exception:  # pragma: no cover - network/runtime guard
         logger.exception("Failed to initialize Supabase client")
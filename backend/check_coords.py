@@ -21,9 +21,12 @@ WRITE_AREAS = [
     ("total_hardness", 64, 983, 438, 65),
     ("residual_chlorine", 574, 983, 438, 65),
 ]
+# Same layout as parallel arrays; shift the whole grid with e.g. COORDS[:, :2] += (dx, dy)
+NAMES = [name for name, *_ in WRITE_AREAS]
+COORDS = np.array([coords for _, *coords in WRITE_AREAS], dtype=np.int32)
 
 # Draw current coordinates in RED
-for name, x, y, w, h in WRITE_AREAS:
+for name, (x, y, w, h) in zip(NAMES, COORDS.tolist()):
     cv2.rectangle(img, (x, y), (x+w, y+h), (0, 0, 255), 2)  # Red
     cv2.putText(img, name[:6], (x+5, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 255), 1)
 
@@ -38,31 +41,27 @@ print("\nSearching for actual write areas by brightness...")
 
 # Expected grid: 2 columns x 5 rows
 # Let's scan in a grid pattern to find bright regions
-for row in range(5):
-    for col in range(2):
-        # Search in a region
-        search_y = 200 + row * 180  # Start at 200, spacing ~180
-        search_x = 60 + col * 510   # Left column at ~60, right at ~570
-        
-        # Sample a 100x50 region
-        region = gray[search_y:search_y+100, search_x:search_x+400]
-        mean_brightness = region.mean()
-        
-        # Find where brightness peaks (center of write area)
-        col_brightness = region.mean(axis=0)
-        row_brightness = region.mean(axis=1)
-        
-        # Most bright row within the search region
-        peak_row = np.argmax(row_brightness)
-        actual_y = search_y + peak_row
-        
-        print(f"  Row {row}, Col {col}: search_y={search_y}, peak_y={actual_y}, brightness={mean_brightness:.1f}")
+grid_rows, grid_cols = np.divmod(np.arange(10), 2)
+search_ys = 200 + grid_rows * 180  # Start at 200, spacing ~180
+search_xs = 60 + grid_cols * 510   # Left column at ~60, right at ~570
+
+# Gather all ten 100x400 search regions into one (10, 100, 400) stack
+regions = gray[
+    search_ys[:, None, None] + np.arange(100)[None, :, None],
+    search_xs[:, None, None] + np.arange(400)[None, None, :],
+]
+mean_brightness = regions.mean(axis=(1, 2))
+
+# Most bright row within each search region (center of write area)
+peak_ys = search_ys + regions.mean(axis=2).argmax(axis=1)
+
+for row, col, search_y, peak_y, brightness in zip(grid_rows, grid_cols, search_ys, peak_ys, mean_brightness):
+    print(f"  Row {row}, Col {col}: search_y={search_y}, peak_y={peak_y}, brightness={brightness:.1f}")
 
 # Let's also measure the actual locations by finding edges
 print("\nLooking for horizontal lines (box borders)...")
-edges = cv2.Canny(gray, 50, 150)
-h_edges = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-h_edges = np.abs(h_edges)
+# 3x3 Sobel responses fit in int16 exactly, a quarter of the float64 traffic
+h_edges = np.abs(cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3))
 
 # Sum across each row to find strong horizontal edges
 row_sums = h_edges.mean(axis=1)
@@ -7,19 +7,22 @@ debug images at each stage to help diagnose coordinate alignment issues.
 Output images saved to: backend/debug_output/
 """
 
+import atexit
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
 import cv2
 import numpy as np
 from pathlib import Path
-from io import BytesIO
-from PIL import Image, ImageOps
 
 # Add the app directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.ml.inference import (
     WRITE_AREAS,
+    _WRITE_AREAS_XYWH,
+    _WRITE_AREAS_NAMES,
     _CANONICAL_WIDTH,
     _CANONICAL_HEIGHT,
     _FIDUCIAL_TARGETS,
@@ -34,11 +37,22 @@ from app.ml.inference import (
     _preprocess_for_ocr_binarized,
     _deskew,
 )
+from app.ml.imaging import decode_bgr
 
 # Output directory
 DEBUG_OUTPUT = Path(__file__).parent / "debug_output"
 DEBUG_OUTPUT.mkdir(exist_ok=True)
 
+# Overlays are drawn on a half-resolution preview unless DEBUG_FULLRES=1
+DEBUG_FULLRES = os.environ.get("DEBUG_FULLRES") == "1"
+
+# VERBOSE=0 drops the per-area printout and coordinate labels in step 4
+VERBOSE = os.environ.get("VERBOSE", "1") == "1"
+
+# DEBUG_SAVE=0 runs detection/warp/crop/preprocessing only: no images are
+# drawn or written, for validation runs where encoding dominates
+DEBUG_SAVE = os.environ.get("DEBUG_SAVE", "1") == "1"
+
 # Colors (BGR)
 GREEN = (0, 255, 0)
 RED = (0, 0, 255)
@@ -49,27 +63,93 @@ MAGENTA = (255, 0, 255)
 WHITE = (255, 255, 255)
 ORANGE = (0, 165, 255)
 
+# One color per write area in the step-4 overlay
+_AREA_COLORS = (GREEN, BLUE, RED, YELLOW, CYAN, MAGENTA, ORANGE, (128, 255, 128), (255, 128, 128), (128, 128, 255))
+
+# Fiducial centers in _FIDUCIAL_TARGETS order, filled in place per warp
+_SRC_PTS = np.empty((4, 2), dtype=np.float32)
+# getPerspectiveTransform takes both point sets as-is only when they are
+# (4, 2) float32; inference keeps the targets in that form
+assert _FIDUCIAL_TARGETS.dtype == np.float32 and _FIDUCIAL_TARGETS.shape == _SRC_PTS.shape
+_SRC_ORDER = ("tl", "tr", "br", "bl")
+
+# Write-area boxes as x1, y1, x2, y2 rows, plus their step-4 coordinate labels
+_AREA_BOXES = np.hstack((_WRITE_AREAS_XYWH[:, :2], _WRITE_AREAS_XYWH[:, :2] + _WRITE_AREAS_XYWH[:, 2:]))
+_AREA_COORD_TEXTS = tuple(f"({x},{y}) {w}x{h}" for x, y, w, h in _WRITE_AREAS_XYWH.tolist())
+
 
-def save_image(image: np.ndarray, filename: str) -> str:
-    """Save image and return path."""
+# PNG encoding runs on a small pool so it overlaps with the next step.
+# OpenCV's default PNG settings (level 1 + RLE) are already its fastest;
+# passing IMWRITE_PNG_COMPRESSION explicitly switches strategy and is slower.
+_SAVE_POOL = ThreadPoolExecutor(max_workers=4)
+_PENDING_SAVES = []
+_LOSSY_QUALITY = 85
+atexit.register(_SAVE_POOL.shutdown, wait=True)
+
+
+def _encode_and_write(path: Path, image: np.ndarray, params: tuple = ()) -> None:
+    """Encode in memory and write the file in one call; fail loudly, unlike imwrite."""
+    ok, buffer = cv2.imencode(path.suffix, image, params)
+    if not ok:
+        raise RuntimeError(f"Could not encode debug image {path}")
+    path.write_bytes(buffer)
+
+
+def save_image(image: np.ndarray, filename: str, lossy: bool = False) -> str:
+    """
+    Queue image for saving and return path (see flush_saves).
+
+    lossy=True writes a JPEG instead, for visualization-only images where
+    pixel fidelity doesn't matter; the OCR crops stay PNG. A no-op when
+    DEBUG_SAVE is off.
+    """
     path = DEBUG_OUTPUT / filename
-    cv2.imwrite(str(path), image)
+    if lossy:
+        path = path.with_suffix(".jpg")
+    if not DEBUG_SAVE:
+        return str(path)
+    params = ()
+    if lossy:
+        params = (cv2.IMWRITE_JPEG_QUALITY, _LOSSY_QUALITY)
+    # Copy so later in-place drawing on the caller's array can't leak in
+    _PENDING_SAVES.append(_SAVE_POOL.submit(_encode_and_write, path, image.copy(), params))
     print(f"  ✓ Saved: {path}")
     return str(path)
 
 
+def flush_saves() -> None:
+    """Block until every queued save_image write has finished."""
+    wait(_PENDING_SAVES)
+    for future in _PENDING_SAVES:
+        future.result()
+    _PENDING_SAVES.clear()
+
+
+def make_preview(image: np.ndarray) -> tuple:
+    """Return (vis, scale): a fresh image to draw overlays on and its scale factor."""
+    if DEBUG_FULLRES:
+        return image.copy(), 1.0
+    return cv2.pyrDown(image), 0.5
+
+
+@lru_cache(maxsize=None)
+def _text_size(text: str, font_scale: float) -> tuple:
+    """getTextSize for draw_text_with_bg; labels repeat across runs and steps."""
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, 1)[0]
+
+
 def draw_text_with_bg(img, text, pos, font_scale=0.5, color=WHITE, bg_color=(0, 0, 0)):
     """Draw text with background for readability."""
     font = cv2.FONT_HERSHEY_SIMPLEX
     thickness = 1
-    (tw, th), _ = cv2.getTextSize(text, font, font_scale, thickness)
+    tw, th = _text_size(text, font_scale)
     x, y = pos
     cv2.rectangle(img, (x - 2, y - th - 4), (x + tw + 2, y + 4), bg_color, -1)
     cv2.putText(img, text, (x, y), font, font_scale, color, thickness)
 
 
 def load_image(image_path: str) -> tuple:
-    """Load image and return (numpy array, original PIL image)."""
+    """Load image and return (BGR numpy array, original bytes)."""
     print(f"\n{'='*60}")
     print(f"Loading image: {image_path}")
     print(f"{'='*60}")
@@ -77,24 +157,24 @@ def load_image(image_path: str) -> tuple:
     with open(image_path, 'rb') as f:
         image_bytes = f.read()
     
-    pil_img = Image.open(BytesIO(image_bytes))
-    pil_img = ImageOps.exif_transpose(pil_img)
-    pil_img = pil_img.convert("RGB")
+    # Same decoder as the app: BGR straight from cv2.imdecode, which also
+    # applies the EXIF orientation
+    image = decode_bgr(image_bytes)
+    height, width = image.shape[:2]
     
-    print(f"  Original size: {pil_img.size}")
+    print(f"  Original size: {(width, height)}")
     
     # Scale to processing size
-    width, height = pil_img.size
     target_long_edge = 1600
     long_edge = max(width, height)
     scale = target_long_edge / long_edge
     
     if abs(scale - 1.0) > 0.05:
         new_size = (int(width * scale), int(height * scale))
-        pil_img = pil_img.resize(new_size, Image.Resampling.LANCZOS)
-        print(f"  Scaled to: {pil_img.size}")
+        interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+        image = cv2.resize(image, new_size, interpolation=interpolation)
+        print(f"  Scaled to: {new_size}")
     
-    image = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
     return image, image_bytes
 
 
@@ -102,7 +182,7 @@ def debug_step1_original(image: np.ndarray) -> np.ndarray:
     """Step 1: Save original loaded image."""
     print(f"\n[Step 1] Original Image")
     print(f"  Shape: {image.shape}")
-    save_image(image, "01_original.png")
+    save_image(image, "01_original.png", lossy=True)
     return image
 
 
@@ -110,42 +190,52 @@ def debug_step2_fiducial_detection(image: np.ndarray) -> tuple:
     """Step 2: Detect fiducials and visualize."""
     print(f"\n[Step 2] Fiducial Detection")
     
-    vis = image.copy()
-    height, width = image.shape[:2]
-    
     # Run detection
     fiducials = _detect_fiducials(image)
     
     if fiducials is None:
         print("  ✗ Fiducials NOT detected!")
-        draw_text_with_bg(vis, "FIDUCIALS NOT FOUND!", (50, 50), 1.0, RED)
-        save_image(vis, "02_fiducials_NOT_FOUND.png")
-        return None, vis
+    else:
+        print(f"  ✓ Detected {len(fiducials)} fiducials:")
+        for label, center in fiducials.items():
+            print(f"    {label.upper()}: ({int(center[0])}, {int(center[1])})")
+    
+    vis = _visualize_fiducials(image, fiducials) if DEBUG_SAVE else None
+    return fiducials, vis
+
+
+def _visualize_fiducials(image: np.ndarray, fiducials: dict) -> np.ndarray:
+    """Draw (and save) the step-2 fiducial overlay."""
+    vis, scale = make_preview(image)
     
-    print(f"  ✓ Detected {len(fiducials)} fiducials:")
+    if fiducials is None:
+        draw_text_with_bg(vis, "FIDUCIALS NOT FOUND!", (50, 50), 1.0, RED)
+        save_image(vis, "02_fiducials_NOT_FOUND.png", lossy=True)
+        return vis
     
     # Draw detected fiducials
     colors = {"tl": GREEN, "tr": BLUE, "br": RED, "bl": YELLOW}
     for label, center in fiducials.items():
         cx, cy = int(center[0]), int(center[1])
+        px, py = int(cx * scale), int(cy * scale)
         color = colors.get(label, WHITE)
         
         # Draw marker
-        cv2.circle(vis, (cx, cy), 20, color, 3)
-        cv2.drawMarker(vis, (cx, cy), color, cv2.MARKER_CROSS, 40, 2)
+        cv2.circle(vis, (px, py), 20, color, 3)
+        cv2.drawMarker(vis, (px, py), color, cv2.MARKER_CROSS, 40, 2)
         
-        # Draw label
-        draw_text_with_bg(vis, f"{label.upper()}: ({cx}, {cy})", (cx + 25, cy), 0.6, color)
-        print(f"    {label.upper()}: ({cx}, {cy})")
+        # Draw label (full-resolution coordinates)
+        draw_text_with_bg(vis, f"{label.upper()}: ({cx}, {cy})", (px + 25, py), 0.6, color)
     
     # Draw lines connecting fiducials
-    pts = [fiducials["tl"], fiducials["tr"], fiducials["br"], fiducials["bl"]]
-    pts = [(int(p[0]), int(p[1])) for p in pts]
+    pts = [(int(fiducials[label][0] * scale), int(fiducials[label][1] * scale)) for label in _SRC_ORDER]
     for i in range(4):
         cv2.line(vis, pts[i], pts[(i+1)%4], CYAN, 2)
+    if scale != 1.0:
+        draw_text_with_bg(vis, f"preview at {scale:g}x", (10, vis.shape[0] - 10), 0.5, WHITE)
     
-    save_image(vis, "02_fiducials_detected.png")
-    return fiducials, vis
+    save_image(vis, "02_fiducials_detected.png", lossy=True)
+    return vis
 
 
 def debug_step3_perspective_warp(image: np.ndarray, fiducials: dict) -> np.ndarray:
@@ -157,16 +247,14 @@ def debug_step3_perspective_warp(image: np.ndarray, fiducials: dict) -> np.ndarr
         # Fallback to deskew
         warped = _deskew(image)
         print(f"  Using deskew fallback. Shape: {warped.shape}")
-        save_image(warped, "03_deskewed_fallback.png")
+        save_image(warped, "03_deskewed_fallback.png", lossy=True)
         return warped
     
     # Apply perspective transform
-    ordered = np.array(
-        [fiducials[label] for label in ("tl", "tr", "br", "bl")],
-        dtype=np.float32,
-    )
+    for row, label in enumerate(_SRC_ORDER):
+        _SRC_PTS[row] = fiducials[label]
     
-    matrix = cv2.getPerspectiveTransform(ordered, _FIDUCIAL_TARGETS)
+    matrix = cv2.getPerspectiveTransform(_SRC_PTS, _FIDUCIAL_TARGETS)
     warped = cv2.warpPerspective(
         image,
         matrix,
@@ -177,7 +265,7 @@ def debug_step3_perspective_warp(image: np.ndarray, fiducials: dict) -> np.ndarr
     
     print(f"  ✓ Warped to canonical size: {warped.shape}")
     print(f"    Target: {_CANONICAL_WIDTH}x{_CANONICAL_HEIGHT}")
-    save_image(warped, "03_warped_canonical.png")
+    save_image(warped, "03_warped_canonical.png", lossy=True)
     return warped
 
 
@@ -189,34 +277,36 @@ def debug_step4_write_areas(warped: np.ndarray) -> np.ndarray:
     print(f"    Left col X: {_LEFT_COL_X}, Right col X: {_RIGHT_COL_X}")
     print(f"    Write area size: {_WRITE_WIDTH}x{_WRITE_HEIGHT}")
     
-    vis = warped.copy()
+    if VERBOSE:
+        print(f"\n  Write areas (NEW field names):")
+        for i, area in enumerate(WRITE_AREAS):
+            print(f"    [{i}] {area.name:25s} @ ({area.x:4d}, {area.y:4d}) size {area.width}x{area.height}")
     
-    # Draw each write area
-    colors = [GREEN, BLUE, RED, YELLOW, CYAN, MAGENTA, ORANGE, (128, 255, 128), (255, 128, 128), (128, 128, 255)]
+    return _visualize_write_areas(warped) if DEBUG_SAVE else None
+
+
+def _visualize_write_areas(warped: np.ndarray) -> np.ndarray:
+    """Draw (and save) the step-4 write-area overlay."""
+    vis, scale = make_preview(warped)
     
-    print(f"\n  Write areas (NEW field names):")
-    for i, area in enumerate(WRITE_AREAS):
-        color = colors[i % len(colors)]
+    # Draw each write area
+    boxes = (_AREA_BOXES * scale).astype(np.int32).tolist()
+    for i, (name, (x0, y0, x1, y1)) in enumerate(zip(_WRITE_AREAS_NAMES, boxes)):
+        color = _AREA_COLORS[i % len(_AREA_COLORS)]
         
         # Draw rectangle
-        cv2.rectangle(
-            vis,
-            (area.x, area.y),
-            (area.x + area.width, area.y + area.height),
-            color,
-            2
-        )
+        cv2.rectangle(vis, (x0, y0), (x1, y1), color, 2)
         
         # Draw field name
-        draw_text_with_bg(vis, area.name, (area.x + 5, area.y + 20), 0.5, color, (0, 0, 0))
+        draw_text_with_bg(vis, name, (x0 + 5, y0 + 20), 0.5, color, (0, 0, 0))
         
-        # Draw coordinates
-        coord_text = f"({area.x},{area.y}) {area.width}x{area.height}"
-        draw_text_with_bg(vis, coord_text, (area.x + 5, area.y + area.height - 8), 0.35, WHITE, (0, 0, 0))
-        
-        print(f"    [{i}] {area.name:25s} @ ({area.x:4d}, {area.y:4d}) size {area.width}x{area.height}")
+        if VERBOSE:
+            # Draw coordinates (full-resolution values)
+            draw_text_with_bg(vis, _AREA_COORD_TEXTS[i], (x0 + 5, y1 - 8), 0.35, WHITE, (0, 0, 0))
+    if scale != 1.0:
+        draw_text_with_bg(vis, f"preview at {scale:g}x", (10, vis.shape[0] - 10), 0.5, WHITE)
     
-    save_image(vis, "04_write_areas_overlay.png")
+    save_image(vis, "04_write_areas_overlay.png", lossy=True)
     return vis
 
 
@@ -224,19 +314,23 @@ def debug_step5_crop_regions(warped: np.ndarray) -> list:
     """Step 5: Crop and save each write area region."""
     print(f"\n[Step 5] Cropped Write Regions")
     
+    # Gray conversion once for the whole image; the preprocessors take the
+    # gray crops as-is
+    warped_gray = cv2.cvtColor(warped, cv2.COLOR_BGR2GRAY)
+    
+    # Clip every box against the image in one go
+    limit = np.array([warped.shape[1], warped.shape[0]] * 2, dtype=np.int32)
+    boxes = np.clip(_AREA_BOXES, 0, limit).tolist()
+    
+    # Crops are views: nothing downstream writes into them, and save_image
+    # takes its own copy for the background writer
     crops = []
-    for i, area in enumerate(WRITE_AREAS):
-        # Crop with bounds checking
-        y1 = max(0, area.y)
-        y2 = min(warped.shape[0], area.y + area.height)
-        x1 = max(0, area.x)
-        x2 = min(warped.shape[1], area.x + area.width)
+    for i, (name, (x1, y1, x2, y2)) in enumerate(zip(_WRITE_AREAS_NAMES, boxes)):
+        crop = warped[y1:y2, x1:x2]
+        crops.append((name, crop, warped_gray[y1:y2, x1:x2]))
         
-        crop = warped[y1:y2, x1:x2].copy()
-        crops.append((area.name, crop))
-        
-        save_image(crop, f"05_crop_{i:02d}_{area.name}.png")
-        print(f"    [{i}] {area.name}: shape {crop.shape}")
+        save_image(crop, f"05_crop_{i:02d}_{name}.png")
+        print(f"    [{i}] {name}: shape {crop.shape}")
     
     return crops
 
@@ -245,14 +339,15 @@ def debug_step6_preprocessing(crops: list) -> list:
     """Step 6: Apply OCR preprocessing to each crop."""
     print(f"\n[Step 6] OCR Preprocessing")
     
+    # The previews are binary, so they are kept (and written) single-channel
     processed = []
-    for i, (name, crop) in enumerate(crops):
+    for i, (name, _, gray_crop) in enumerate(crops):
         # Method 1: Simple adaptive threshold
-        proc1 = _preprocess_for_ocr_simple(crop)
+        proc1 = _preprocess_for_ocr_simple(gray_crop, return_gray=True)
         save_image(proc1, f"06a_preproc_simple_{i:02d}_{name}.png")
         
         # Method 2: Otsu binarization
-        proc2 = _preprocess_for_ocr_binarized(crop)
+        proc2 = _preprocess_for_ocr_binarized(gray_crop, return_gray=True)
         save_image(proc2, f"06b_preproc_otsu_{i:02d}_{name}.png")
         
         processed.append((name, proc1, proc2))
@@ -268,39 +363,51 @@ def debug_step7_summary_grid(warped: np.ndarray, crops: list) -> np.ndarray:
     # Create a grid showing warped image + all crops
     cell_h, cell_w = 100, 200
     rows, cols = 5, 4  # 5 rows, 4 columns (left crop, left proc, right crop, right proc)
-    
-    grid = np.ones((rows * cell_h + 50, cols * cell_w, 3), dtype=np.uint8) * 240
+    pad = 5
+    background = (240, 240, 240)
+    blank = np.full((cell_h, cell_w, 3), 240, dtype=np.uint8)
+    
+    # Build every cell as a full-size tile, then assemble the grid in one
+    # hconcat/vconcat pass instead of pasting into a canvas
+    labels = []
+    grid_rows = []
+    for row in range(rows):
+        tiles = []
+        for idx in (row * 2, row * 2 + 1):
+            if idx >= len(crops):
+                tiles.extend((blank, blank))
+                continue
+            name, crop, _ = crops[idx]
+            
+            # Resize crop to fit cell
+            h, w = crop.shape[:2]
+            scale = min((cell_w - 2 * pad) / w, (cell_h - 25) / h)
+            new_w, new_h = int(w * scale), int(h * scale)
+            resized = cv2.resize(crop, (new_w, new_h))
+            if len(resized.shape) == 2:
+                resized = cv2.cvtColor(resized, cv2.COLOR_GRAY2BGR)
+            
+            tiles.append(cv2.copyMakeBorder(
+                resized, pad, cell_h - pad - new_h, pad, cell_w - pad - new_w,
+                cv2.BORDER_CONSTANT, value=background,
+            ))
+            tiles.append(blank)
+            
+            # Label, drawn once the grid is assembled
+            x_offset = (len(tiles) - 2) * cell_w + pad
+            y_offset = row * cell_h + 50 + pad
+            labels.append((name[:15], (x_offset, y_offset + new_h + 15)))
+        grid_rows.append(cv2.hconcat(tiles))
+    
+    title = np.full((50, cols * cell_w, 3), 240, dtype=np.uint8)
+    grid = cv2.vconcat([title] + grid_rows)
     
     # Title
-    draw_text_with_bg(grid, "OCR Debug Summary - Cropped Regions & Preprocessing", (10, 30), 0.7, (0, 0, 0), (240, 240, 240))
-    
-    for row in range(5):
-        left_idx = row * 2
-        right_idx = row * 2 + 1
-        
-        for col_offset, idx in enumerate([left_idx, right_idx]):
-            if idx < len(crops):
-                name, crop = crops[idx]
-                
-                # Resize crop to fit cell
-                h, w = crop.shape[:2]
-                scale = min((cell_w - 10) / w, (cell_h - 25) / h)
-                new_w, new_h = int(w * scale), int(h * scale)
-                resized = cv2.resize(crop, (new_w, new_h))
-                
-                # Position in grid
-                x_offset = col_offset * 2 * cell_w + 5
-                y_offset = row * cell_h + 55
-                
-                # Paste
-                if len(resized.shape) == 2:
-                    resized = cv2.cvtColor(resized, cv2.COLOR_GRAY2BGR)
-                grid[y_offset:y_offset+new_h, x_offset:x_offset+new_w] = resized
-                
-                # Label
-                draw_text_with_bg(grid, name[:15], (x_offset, y_offset + new_h + 15), 0.35, (0, 0, 0), (240, 240, 240))
+    draw_text_with_bg(grid, "OCR Debug Summary - Cropped Regions & Preprocessing", (10, 30), 0.7, (0, 0, 0), background)
+    for text, pos in labels:
+        draw_text_with_bg(grid, text, pos, 0.35, (0, 0, 0), background)
     
-    save_image(grid, "07_summary_grid.png")
+    save_image(grid, "07_summary_grid.png", lossy=True)
     return grid
 
 
@@ -312,9 +419,11 @@ def run_full_debug(image_path: str):
     print("="*70)
     
     # Clear old debug files
-    for f in DEBUG_OUTPUT.glob("*.png"):
-        f.unlink()
-    print(f"\n  Cleared old debug files from {DEBUG_OUTPUT}")
+    if DEBUG_SAVE:
+        for pattern in ("*.png", "*.jpg"):
+            for f in DEBUG_OUTPUT.glob(pattern):
+                f.unlink()
+        print(f"\n  Cleared old debug files from {DEBUG_OUTPUT}")
     
     # Load image
     image, image_bytes = load_image(image_path)
@@ -337,22 +446,27 @@ def run_full_debug(image_path: str):
     # Step 6: Preprocessing
     processed = debug_step6_preprocessing(crops)
     
-    # Step 7: Summary grid
-    debug_step7_summary_grid(warped, crops)
+    # Step 7: Summary grid (visualization only)
+    if DEBUG_SAVE:
+        debug_step7_summary_grid(warped, crops)
+    flush_saves()
     
     # Final summary
     print("\n" + "="*70)
     print("  DEBUG COMPLETE")
     print("="*70)
+    if not DEBUG_SAVE:
+        print("\n  DEBUG_SAVE=0: no images were written")
+        return
     print(f"\n  Output files saved to: {DEBUG_OUTPUT}")
     print(f"\n  Files created:")
-    for f in sorted(DEBUG_OUTPUT.glob("*.png")):
+    for f in sorted([*DEBUG_OUTPUT.glob("*.png"), *DEBUG_OUTPUT.glob("*.jpg")]):
         print(f"    - {f.name}")
     
     print(f"\n  Key files to check:")
-    print(f"    1. 02_fiducials_detected.png - Verify fiducial detection")
-    print(f"    2. 03_warped_canonical.png   - Check perspective correction")
-    print(f"    3. 04_write_areas_overlay.png - VERIFY BOX ALIGNMENT!")
+    print(f"    1. 02_fiducials_detected.jpg - Verify fiducial detection")
+    print(f"    2. 03_warped_canonical.jpg   - Check perspective correction")
+    print(f"    3. 04_write_areas_overlay.jpg - VERIFY BOX ALIGNMENT!")
     print(f"    4. 05_crop_*.png             - Individual cropped regions")
     print(f"    5. 06*_preproc_*.png         - Preprocessed for OCR")
 
@@ -2,23 +2,30 @@ import cv2
 import numpy as np
 import easyocr
 
+# Built once so the preprocessing below can be looped over many regions
+CLAHE = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
+KERNEL = np.ones((2, 2), np.uint8)
+
+
+def preprocess(region, C=35):
+    gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
+    # pyrUp is the exact-2x upscale (5-tap Gaussian), cheaper than a cubic resize
+    scaled = cv2.pyrUp(gray)
+    normalized = CLAHE.apply(scaled)
+    blurred = cv2.GaussianBlur(normalized, (5, 5), 0)
+    binary = cv2.adaptiveThreshold(blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, C)
+    cleaned = cv2.morphologyEx(binary, cv2.MORPH_OPEN, KERNEL)
+    cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, KERNEL)
+    return cv2.copyMakeBorder(cleaned, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=255)
+
+
 region = cv2.imread('debug_output/region_00_pH_raw.png')
-gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
-h, w = gray.shape
-scaled = cv2.resize(gray, (w * 2, h * 2), interpolation=cv2.INTER_CUBIC)
-clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-normalized = clahe.apply(scaled)
-blurred = cv2.GaussianBlur(normalized, (5, 5), 0)
 
 # Create reader
 reader = easyocr.Reader(['en'], gpu=False, verbose=False)
 
 # Test C=35
-binary = cv2.adaptiveThreshold(blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 35)
-kernel = np.ones((2, 2), np.uint8)
-cleaned = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
-cleaned = cv2.morphologyEx(cleaned, cv2.MORPH_CLOSE, kernel)
-padded = cv2.copyMakeBorder(cleaned, 10, 10, 10, 10, cv2.BORDER_CONSTANT, value=255)
+padded = preprocess(region, C=35)
 rgb = cv2.cvtColor(padded, cv2.COLOR_GRAY2BGR)
 
 cv2.imwrite('debug_output/test_pH_final.png', padded)
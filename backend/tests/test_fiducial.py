@@ -0,0 +1,60 @@
+import random
+
+from app.routes.fiducial import _dedup_detections
+
+
+def _old_dedup(detected):
+    """The original nested-loop duplicate removal."""
+    unique = []
+    for det in detected:
+        is_dup = False
+        for exist in unique:
+            dist = ((det[0] - exist[0]) ** 2 + (det[1] - exist[1]) ** 2) ** 0.5
+            if dist < max(det[2], exist[2]) * 0.8:
+                is_dup = True
+                break
+        if not is_dup:
+            unique.append(det)
+    return unique
+
+
+def _random_detections(rng, count):
+    # Clustered so that many detections are near-duplicates of each other
+    centers = [(rng.uniform(0, 400), rng.uniform(0, 400)) for _ in range(max(1, count // 3))]
+    detections = []
+    for _ in range(count):
+        cx, cy = rng.choice(centers)
+        size = float(rng.randint(8, 60))
+        detections.append((cx + rng.uniform(-30, 30), cy + rng.uniform(-30, 30), size, size))
+    return detections
+
+
+def test_empty_candidates():
+    assert _dedup_detections([(10.0, 10.0, 20.0, 20.0)], []) == []
+
+
+def test_drops_duplicates_of_unique_and_of_earlier_candidates():
+    unique = [(100.0, 100.0, 40.0, 40.0)]
+    candidates = [
+        (110.0, 100.0, 20.0, 20.0),  # within 0.8 * 40 of the existing marker
+        (300.0, 300.0, 20.0, 20.0),
+        (305.0, 300.0, 20.0, 20.0),  # duplicate of the previous candidate
+        (200.0, 100.0, 20.0, 20.0),
+    ]
+    assert _dedup_detections(unique, candidates) == [candidates[1], candidates[3]]
+
+
+def test_distance_limit_is_exclusive():
+    unique = [(0.0, 0.0, 10.0, 10.0)]
+    assert _dedup_detections(unique, [(8.0, 0.0, 10.0, 10.0)]) == [(8.0, 0.0, 10.0, 10.0)]
+    assert _dedup_detections(unique, [(7.9, 0.0, 10.0, 10.0)]) == []
+
+
+def test_matches_old_dedup():
+    rng = random.Random(0)
+    for _ in range(500):
+        detected = _random_detections(rng, rng.randint(0, 25))
+        split = rng.randint(0, len(detected))
+        unique = _old_dedup(detected[:split])
+        candidates = detected[split:]
+        assert unique + _dedup_detections(unique, candidates) == _old_dedup(unique + candidates)
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("supabase")
+
+from tools.import_water_samples import _to_bool  # noqa: E402
+
+
+def _old_to_bool(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    try:
+        return bool(int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        pd.Series([0, 1, 2, -1]),
+        pd.Series([0.0, 1.0, np.nan, 0.5, -0.7, 2.9]),
+        pd.Series([True, False]),
+        pd.Series(["1", "0", " 1", "1.0", "yes", "", None, "-3", "1e3", np.nan, 1.0], dtype=object),
+        pd.Series([], dtype=float),
+    ],
+)
+def test_to_bool_matches_old_per_value_conversion(values):
+    result = _to_bool(values)
+    assert result.dtype == "boolean"
+    assert result.index.equals(values.index)
+    assert [None if flag is pd.NA else flag for flag in result.tolist()] == [_old_to_bool(v) for v in values]
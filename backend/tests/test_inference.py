@@ -0,0 +1,135 @@
+import random
+import re
+
+import numpy as np
+import pytest
+
+from app.ml.inference import EXTRACTOR, _BOX_MIN_OVERLAP, _OCR_PAD, _OCR_UPSCALE, _boxes_for_crop, _is_numeric
+
+
+# Reference implementations the str-method versions replaced
+
+_NUMERIC_PATTERN = re.compile(r"-?(?:\d+\.?\d*|\d*\.\d+)")
+
+
+def _old_clean_numeric(text):
+    if not text:
+        return ""
+    corrections = {"O": "0", "o": "0", "l": "1", "I": "1", "|": "1", ",": "."}
+    result = [corrections.get(char, char) for char in text]
+    cleaned = ""
+    has_decimal = False
+    for char in result:
+        if char.isdigit():
+            cleaned += char
+        elif char == "." and not has_decimal:
+            cleaned += "."
+            has_decimal = True
+    if cleaned and len(cleaned) > 1:
+        if cleaned.startswith("0") and len(cleaned) > 1 and cleaned[1] != ".":
+            cleaned = cleaned.lstrip("0") or "0"
+    if cleaned.endswith("."):
+        cleaned = cleaned[:-1]
+    if cleaned.startswith("."):
+        cleaned = "0" + cleaned
+    return cleaned
+
+
+def _old_is_valid_number(text):
+    if not text:
+        return False
+    try:
+        return -50 <= float(text) <= 50000
+    except ValueError:
+        return False
+
+
+# Characters OCR tokens are made of, plus a few that must be dropped
+_ALPHABET = "0123456789.,-OolI| aZ%²٣"
+
+
+def _random_tokens(count, seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 8))) for _ in range(count)]
+
+
+_EDGE_TOKENS = ["", ".", "-", "-.", "0", "00", "007", "0.5", ".5", "5.", "1,5", "O.l", "50000", "50001", "-50", "-51", "9999", "12345.6"]
+
+
+@pytest.mark.parametrize("text", _EDGE_TOKENS)
+def test_clean_numeric_edge_cases(text):
+    assert EXTRACTOR._clean_numeric(text) == _old_clean_numeric(text)
+
+
+def test_clean_numeric_matches_old_behaviour():
+    for text in _random_tokens(20000):
+        assert EXTRACTOR._clean_numeric(text) == _old_clean_numeric(text), text
+
+
+def test_is_numeric_matches_pattern():
+    for text in _EDGE_TOKENS + _random_tokens(20000, seed=1):
+        assert _is_numeric(text) == bool(_NUMERIC_PATTERN.fullmatch(text)), text
+
+
+@pytest.mark.parametrize("text", _EDGE_TOKENS)
+def test_is_valid_number_edge_cases(text):
+    assert EXTRACTOR._is_valid_number(text) == _old_is_valid_number(text)
+
+
+def test_is_valid_number_matches_old_behaviour_on_cleaned_text():
+    # _is_valid_number only ever sees _clean_numeric output
+    for text in _random_tokens(20000, seed=2):
+        cleaned = EXTRACTOR._clean_numeric(text)
+        assert EXTRACTOR._is_valid_number(cleaned) == _old_is_valid_number(cleaned), cleaned
+
+
+def _mapped(x1, y1, x2, y2, bounds):
+    return [(x1 - bounds[0]) * _OCR_UPSCALE + _OCR_PAD, (y1 - bounds[1]) * _OCR_UPSCALE + _OCR_PAD,
+            (x2 - bounds[0]) * _OCR_UPSCALE + _OCR_PAD, (y2 - bounds[1]) * _OCR_UPSCALE + _OCR_PAD]
+
+
+def test_boxes_for_crop_keeps_and_maps_inner_box():
+    bounds = (100, 200, 300, 260)
+    boxes = np.array([[120, 210, 180, 250]], dtype=np.int32)
+    assert _boxes_for_crop(boxes, bounds).tolist() == [_mapped(120, 210, 180, 250, bounds)]
+
+
+def test_boxes_for_crop_clips_box_spanning_label_and_value():
+    # The detector merged the printed label (left of the crop) with the
+    # written value; most of the box lies inside the crop
+    bounds = (100, 200, 300, 260)
+    boxes = np.array([[40, 205, 250, 255]], dtype=np.int32)
+    assert _boxes_for_crop(boxes, bounds).tolist() == [_mapped(100, 205, 250, 255, bounds)]
+
+
+def test_boxes_for_crop_drops_small_overlaps():
+    bounds = (100, 200, 300, 260)
+    boxes = np.array(
+        [
+            [0, 200, 100, 260],    # touches the left edge only
+            [300, 200, 400, 260],  # touches the right edge only
+            [80, 200, 104, 260],   # 4 of 24 px wide inside: below the overlap ratio
+            [120, 300, 180, 340],  # below the crop
+        ],
+        dtype=np.int32,
+    )
+    assert _boxes_for_crop(boxes, bounds).shape == (0, 4)
+
+
+def test_boxes_for_crop_overlap_threshold_is_inclusive():
+    bounds = (100, 200, 300, 260)
+    # A quarter of this 40 px wide box lies inside the crop
+    width = 40
+    inside = int(width * _BOX_MIN_OVERLAP)
+    boxes = np.array([[100 - (width - inside), 210, 100 + inside, 250]], dtype=np.int32)
+    assert len(_boxes_for_crop(boxes, bounds)) == 1
+    boxes[0, 0] -= 1
+    boxes[0, 2] -= 1
+    assert len(_boxes_for_crop(boxes, bounds)) == 0
+
+
+def test_boxes_for_crop_measures_large_boxes_against_the_crop():
+    # Boxes bigger than the crop need to cover a quarter of the crop, not of themselves
+    bounds = (100, 200, 300, 260)
+    boxes = np.array([[0, 0, 160, 1000], [0, 0, 140, 1000]], dtype=np.int32)
+    assert _boxes_for_crop(boxes, bounds).tolist() == [_mapped(100, 200, 160, 260, bounds)]
@@ -0,0 +1,33 @@
+import cv2
+import numpy as np
+import pytest
+from PIL import Image, ImageOps
+
+from app.services.ocr import _autocontrast
+
+
+def _pil_autocontrast(image, cutoff):
+    rgb = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    return cv2.cvtColor(np.array(ImageOps.autocontrast(rgb, cutoff=cutoff)), cv2.COLOR_RGB2BGR)
+
+
+def _images():
+    rng = np.random.default_rng(0)
+    yield rng.integers(0, 256, (64, 80, 3), dtype=np.uint8)
+    # Low-contrast capture: every channel squeezed into a narrow band
+    yield rng.integers(90, 140, (120, 90, 3), dtype=np.uint8)
+    # Mostly white page with dark strokes
+    page = np.full((100, 100, 3), 235, dtype=np.uint8)
+    page[40:60, 10:90] = rng.integers(0, 60, (20, 80, 3), dtype=np.uint8)
+    yield page
+    # One flat channel, where the stretch leaves it untouched
+    flat = rng.integers(0, 256, (50, 50, 3), dtype=np.uint8)
+    flat[..., 1] = 77
+    yield flat
+    yield np.full((10, 10, 3), 128, dtype=np.uint8)
+
+
+@pytest.mark.parametrize("cutoff", [0, 1, 2, 5])
+def test_autocontrast_matches_pil(cutoff):
+    for image in _images():
+        assert np.array_equal(_autocontrast(image, cutoff), _pil_autocontrast(image, cutoff))
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterator, List, Optional, Set
 
+import numpy as np
 import pandas as pd
 from supabase import Client, create_client
 
 from app.core.config import get_settings
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the supabase-py insert builder
+    orjson = None
+
 COLUMN_MAP = {
     "ph": "ph",
     "Hardness": "hardness",
@@ -23,6 +30,7 @@ COLUMN_MAP = {
 }
 
 DEFAULT_BATCH_SIZE = 500
+DEFAULT_CONCURRENCY = 4
 
 
 def get_supabase_client() -> Client:
@@ -34,23 +42,44 @@ def get_supabase_client() -> Client:
     return create_client(settings.supabase_url, settings.supabase_service_key)
 
 
-def load_csv(csv_path: Path) -> pd.DataFrame:
+def iter_batches(csv_path: Path, batch_size: int) -> Iterator[pd.DataFrame]:
+    """Yield cleaned batches of ``batch_size`` rows, reading the CSV lazily."""
     if not csv_path.exists():
         raise FileNotFoundError(csv_path)
 
-    df = pd.read_csv(csv_path)
-    missing = [col for col in COLUMN_MAP if col not in df.columns]
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    missing = [col for col in COLUMN_MAP if col not in columns]
     if missing:
         raise ValueError(f"CSV is missing expected columns: {', '.join(missing)}")
 
-    df = df.rename(columns=COLUMN_MAP)
-    df["is_potable"] = df["is_potable"].apply(_to_bool)
-    # Convert to object dtype before replacing NaN so JSON serialization sees None
-    df = df.astype(object).where(pd.notnull(df), None)
-    return df
+    # Only one chunk is resident at a time, so memory stays bounded by the
+    # batch size rather than the file size
+    features = [dst for dst in COLUMN_MAP.values() if dst != "is_potable"]
+    with pd.read_csv(csv_path, chunksize=batch_size) as reader:
+        for chunk in reader:
+            chunk = chunk.rename(columns=COLUMN_MAP)
+            # Dtypes are inferred per chunk, so pin the readings to numbers
+            # here; a stray non-numeric cell becomes null instead of failing
+            chunk[features] = chunk[features].apply(pd.to_numeric, errors="coerce")
+            chunk["is_potable"] = _to_bool(chunk["is_potable"])
+            yield chunk
+
+
+def _to_bool(values: pd.Series) -> pd.Series:
+    """Vectorized ``bool(int(value))``; unparseable or missing values become NA."""
+    if values.dtype == object:
+        # Text cells only parse when int() accepts them ("1.0" does not), so
+        # the rare mixed column keeps the per-value conversion
+        return values.map(_cell_to_bool).astype("boolean")
+    numbers = pd.to_numeric(values, errors="coerce")
+    flags = np.trunc(numbers.to_numpy(dtype=float, na_value=np.nan)) != 0
+    return pd.Series(
+        pd.arrays.BooleanArray(flags, numbers.isna().to_numpy()),
+        index=values.index,
+    )
 
 
-def _to_bool(value):
+def _cell_to_bool(value) -> Optional[bool]:
     if value is None or (isinstance(value, float) and pd.isna(value)):
         return None
     try:
@@ -59,26 +88,68 @@ def _to_bool(value):
         return None
 
 
-def chunk_rows(df: pd.DataFrame, size: int) -> Iterable[pd.DataFrame]:
-    total = len(df)
-    for start in range(0, total, size):
-        yield df.iloc[start : start + size]
-
-
 def insert_batch(client: Client, table_name: str, batch: pd.DataFrame) -> None:
+    session = getattr(getattr(client, "postgrest", None), "session", None)
+    if orjson is not None and session is not None:
+        _post_batch(session, table_name, batch)
+        return
+
+    # Convert to object dtype before replacing NaN so JSON serialization sees
+    # None; doing it per batch avoids an object copy of the whole frame
+    batch = batch.astype(object).where(batch.notna(), None)
     payload: List[dict] = batch.to_dict(orient="records")
     response = client.table(table_name).insert(payload).execute()
     if getattr(response, "error", None):
         raise RuntimeError(response.error)
 
 
-def run(csv_path: Path, table_name: str, batch_size: int) -> None:
+def _post_batch(session, table_name: str, batch: pd.DataFrame) -> None:
+    """
+    POST a batch straight through the PostgREST session with an orjson body.
+
+    orjson writes NaN floats as null, so only the nullable boolean column
+    needs converting; the request builder's stdlib json pass is skipped.
+    """
+    batch = batch.assign(
+        is_potable=batch["is_potable"].astype(object).where(batch["is_potable"].notna(), None)
+    )
+    response = session.post(
+        f"/{table_name}",
+        content=orjson.dumps(batch.to_dict(orient="records")),
+        headers={"Content-Type": "application/json", "Prefer": "return=minimal"},
+    )
+    if response.is_error:
+        raise RuntimeError(response.text)
+
+
+def _drain(pending: Set[Future], limit: int) -> None:
+    """Wait until at most ``limit`` inserts are in flight, re-raising failures."""
+    while len(pending) > limit:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.discard(future)
+            future.result()
+
+
+def run(
+    csv_path: Path,
+    table_name: str,
+    batch_size: int,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> None:
     client = get_supabase_client()
-    df = load_csv(csv_path)
-    for batch in chunk_rows(df, batch_size):
-        insert_batch(client, table_name, batch)
+    total = 0
+    # Inserts are network-bound, so overlap a few of them on one shared client.
+    # Submission is throttled to the pool size so the CSV is still read lazily
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for batch in iter_batches(csv_path, batch_size):
+            pending.add(pool.submit(insert_batch, client, table_name, batch))
+            total += len(batch)
+            _drain(pending, max(1, concurrency) - 1)
+        _drain(pending, 0)
     print(
-        f"Finished importing {len(df)} rows from {csv_path} into {table_name}"
+        f"Finished importing {total} rows from {csv_path} into {table_name}"
     )
 
 
@@ -101,9 +172,15 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_BATCH_SIZE,
         help="Number of rows to send per insert request",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Number of insert requests to run in parallel",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    run(args.csv, args.table, args.batch_size)
+    run(args.csv, args.table, args.batch_size, args.concurrency)
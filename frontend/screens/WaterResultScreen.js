@@ -158,7 +158,9 @@ const WaterResultScreen = ({ visible, onClose, result }) => {
 							<Text className={`mt-3 text-[12px] ${result.saved ? 'text-emerald-300' : 'text-slate-400'}`}>
 								{result.saved
 									? 'Sample synced to Supabase.'
-									: 'Cloud sync unavailable. Check Supabase credentials.'}
+									: result.queued
+										? 'Sample queued for Supabase sync.'
+										: 'Cloud sync unavailable. Check Supabase credentials.'}
 							</Text>
 						</View>
 